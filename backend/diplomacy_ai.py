@@ -8,21 +8,117 @@ and historical relationships.
 
 import random
 import math
+import os
+import re
+import heapq
+import itertools
+import string
 import time
-from typing import Dict, List, Tuple, Set, Optional, TYPE_CHECKING, Any
+from types import MappingProxyType
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, NamedTuple, Tuple, Set, Optional, TYPE_CHECKING, Any
 
 # This allows forward references in type hints
 if TYPE_CHECKING:
     from typing import TypeVar
     Coalition = TypeVar('Coalition')
 
+# Environmental policy terms compared when profiles carry text descriptions
+_ENV_TERMS = ("renewable", "sustainable", "climate", "green", "carbon")
+_ENV_TERMS_RE = re.compile("|".join(_ENV_TERMS))
+
+# Cooperation modifier applied per diplomatic incident type
+_INCIDENT_MODIFIERS = {"cooperative": 0.1, "aggressive": -0.2}
+
+# Sentinel for optional attributes that have not been set
+_MISSING = object()
+
+# Country attributes copied into explanation context, as (attribute, context key)
+_COUNTRY_CONTEXT_FIELDS = (
+    ('economic', (
+        ('gdp', 'gdp'),
+        ('gdp_growth', 'gdp_growth'),
+        ('unemployment_rate', 'unemployment'),
+        ('inflation', 'inflation')
+    )),
+    ('domestic', (
+        ('approval_rating', 'approval'),
+        ('stability', 'stability')
+    ))
+)
+
+# Stand-in countries mapping for a game state without countries
+_NO_COUNTRIES = MappingProxyType({})
+
+# Capitalized decision type labels for explanation reports, filled on first use
+_DECISION_LABELS = {}
+
+# Names for common countries, used when the game state does not provide one
+_ISO_TO_NAME = {
+    'US': 'United States',
+    'CN': 'China',
+    'RU': 'Russia',
+    'DE': 'Germany',
+    'FR': 'France',
+    'GB': 'United Kingdom',
+    'JP': 'Japan',
+    'IN': 'India',
+    'BR': 'Brazil',
+    'IT': 'Italy',
+    'CA': 'Canada',
+    'KR': 'South Korea',
+    'AU': 'Australia',
+    'ES': 'Spain',
+    'MX': 'Mexico',
+    'ID': 'Indonesia',
+    'TR': 'Turkey',
+    'SA': 'Saudi Arabia',
+    'CH': 'Switzerland',
+    'NL': 'Netherlands',
+    'SE': 'Sweden',
+    'NO': 'Norway',
+    'DK': 'Denmark',
+    'FI': 'Finland'
+}
+
 class CountryProfile:
     """
     Represents the personality and behavioral traits of a country in the simulation.
     These traits influence AI decision-making, diplomatic behavior, and responses to events.
     """
-    
-    def __init__(self, 
+
+    # Core behavioral traits, in constructor order
+    TRAIT_NAMES = (
+        'protectionism', 'free_market_belief', 'export_orientation', 'self_sufficiency',
+        'sector_protection', 'innovation_focus', 'economic_focus', 'debt_tolerance',
+        'cooperation', 'isolationism', 'retaliation', 'aggression', 'regional_focus',
+        'pride', 'pragmatism', 'risk_aversion', 'accountability',
+        'sanctions_resilience', 'technology_policy', 'environmental_policy',
+        'geopolitical_alignment', 'state_enterprise_dominance', 'corruption_index',
+        'labor_market_flexibility', 'regional_leadership_role', 'resource_nationalism'
+    )
+
+    # Optional country data that may be attached after construction.
+    # These stay unset until assigned, so hasattr() checks keep working.
+    OPTIONAL_ATTRIBUTES = (
+        'name', 'government_type', 'research_percent_gdp', 'exports_percent_gdp',
+        'imports_percent_gdp', 'key_trade_partners', 'leadership_traits',
+        'resource_dependency', 'diplomatic_incidents'
+    )
+
+    __slots__ = TRAIT_NAMES + OPTIONAL_ATTRIBUTES
+
+    # Result keys for get_trade_strategy and get_sanctions_approach
+    TRADE_STRATEGY_KEYS = (
+        'protectionism', 'free_trade', 'strategic_trade',
+        'resource_focus', 'technology_control', 'regional_integration'
+    )
+    SANCTIONS_APPROACH_KEYS = (
+        'impose_sanctions', 'withstand_sanctions',
+        'diplomatic_resolution', 'counter_sanctions'
+    )
+
+    def __init__(self,
                  # Economic traits
                  protectionism: float = 0.5,
                  free_market_belief: float = 0.5,
@@ -130,17 +226,20 @@ class CountryProfile:
         self.resource_nationalism = validate_trait(resource_nationalism)
     
     @classmethod
-    def generate_random(cls):
-        """Generate a random country profile for testing."""
-        return cls(**{trait: random.uniform(0.1, 0.9) for trait in [
-            'protectionism', 'free_market_belief', 'export_orientation', 'self_sufficiency',
-            'sector_protection', 'innovation_focus', 'economic_focus', 'debt_tolerance',
-            'cooperation', 'isolationism', 'retaliation', 'aggression', 'regional_focus',
-            'pride', 'pragmatism', 'risk_aversion', 'accountability',
-            'sanctions_resilience', 'technology_policy', 'environmental_policy',
-            'geopolitical_alignment', 'state_enterprise_dominance', 'corruption_index',
-            'labor_market_flexibility', 'regional_leadership_role', 'resource_nationalism'
-        ]})
+    def generate_random(cls, rng: Optional[random.Random] = None):
+        """
+        Generate a random country profile for testing.
+        
+        Args:
+            rng: Optional random.Random instance for reproducible profiles
+                 (defaults to the module-level generator)
+        """
+        uniform = (rng or random).uniform
+        # Draws already lie in the valid trait range, so skip __init__ validation
+        profile = cls.__new__(cls)
+        for trait in cls.TRAIT_NAMES:
+            setattr(profile, trait, uniform(0.1, 0.9))
+        return profile
     
     def get_trade_strategy(self) -> Dict[str, float]:
         """
@@ -149,34 +248,38 @@ class CountryProfile:
         Returns:
             Dictionary mapping strategy types to preference values (0.0-1.0)
         """
-        strategies = {
-            "protectionism": (self.protectionism * 0.5 + self.self_sufficiency * 0.3 + 
-                             (1 - self.free_market_belief) * 0.2),
-            
-            "free_trade": (self.free_market_belief * 0.4 + (1 - self.protectionism) * 0.3 + 
-                          (1 - self.isolationism) * 0.2 + self.cooperation * 0.1),
-            
-            "strategic_trade": (self.sector_protection * 0.3 + self.pragmatism * 0.3 + 
-                               self.economic_focus * 0.2 + self.innovation_focus * 0.2),
-            
-            "resource_focus": (self.resource_nationalism * 0.5 + 
-                              self.state_enterprise_dominance * 0.3 + 
-                              self.self_sufficiency * 0.2),
-            
-            "technology_control": (self.technology_policy * 0.4 + 
-                                  self.innovation_focus * 0.3 + 
-                                  self.state_enterprise_dominance * 0.3),
-            
-            "regional_integration": (self.regional_focus * 0.4 + 
-                                    self.regional_leadership_role * 0.3 + 
-                                    self.cooperation * 0.3)
-        }
+        values = (
+            # protectionism
+            (self.protectionism * 0.5 + self.self_sufficiency * 0.3 + 
+             (1 - self.free_market_belief) * 0.2),
+            
+            # free_trade
+            (self.free_market_belief * 0.4 + (1 - self.protectionism) * 0.3 + 
+             (1 - self.isolationism) * 0.2 + self.cooperation * 0.1),
+            
+            # strategic_trade
+            (self.sector_protection * 0.3 + self.pragmatism * 0.3 + 
+             self.economic_focus * 0.2 + self.innovation_focus * 0.2),
+            
+            # resource_focus
+            (self.resource_nationalism * 0.5 + 
+             self.state_enterprise_dominance * 0.3 + 
+             self.self_sufficiency * 0.2),
+            
+            # technology_control
+            (self.technology_policy * 0.4 + 
+             self.innovation_focus * 0.3 + 
+             self.state_enterprise_dominance * 0.3),
+            
+            # regional_integration
+            (self.regional_focus * 0.4 + 
+             self.regional_leadership_role * 0.3 + 
+             self.cooperation * 0.3)
+        )
         
         # Normalize to ensure all values are between 0 and 1
-        for strategy in strategies:
-            strategies[strategy] = max(0.0, min(1.0, strategies[strategy]))
-            
-        return strategies
+        return {key: max(0.0, min(1.0, value))
+                for key, value in zip(self.TRADE_STRATEGY_KEYS, values)}
     
     def get_sanctions_approach(self) -> Dict[str, float]:
         """
@@ -185,31 +288,33 @@ class CountryProfile:
         Returns:
             Dictionary mapping sanction approaches to preference values (0.0-1.0)
         """
-        approaches = {
-            "impose_sanctions": (self.aggression * 0.3 + 
-                                self.retaliation * 0.3 + 
-                                self.economic_focus * 0.2 + 
-                                self.pride * 0.2),
-            
-            "withstand_sanctions": (self.sanctions_resilience * 0.4 + 
-                                   self.self_sufficiency * 0.3 + 
-                                   self.pride * 0.2 + 
-                                   (1 - self.cooperation) * 0.1),
-            
-            "diplomatic_resolution": (self.cooperation * 0.4 + 
-                                     self.pragmatism * 0.3 + 
-                                     (1 - self.aggression) * 0.3),
-            
-            "counter_sanctions": (self.retaliation * 0.5 + 
-                                 self.aggression * 0.3 + 
-                                 self.pride * 0.2)
-        }
+        values = (
+            # impose_sanctions
+            (self.aggression * 0.3 + 
+             self.retaliation * 0.3 + 
+             self.economic_focus * 0.2 + 
+             self.pride * 0.2),
+            
+            # withstand_sanctions
+            (self.sanctions_resilience * 0.4 + 
+             self.self_sufficiency * 0.3 + 
+             self.pride * 0.2 + 
+             (1 - self.cooperation) * 0.1),
+            
+            # diplomatic_resolution
+            (self.cooperation * 0.4 + 
+             self.pragmatism * 0.3 + 
+             (1 - self.aggression) * 0.3),
+            
+            # counter_sanctions
+            (self.retaliation * 0.5 + 
+             self.aggression * 0.3 + 
+             self.pride * 0.2)
+        )
         
         # Normalize to ensure all values are between 0 and 1
-        for approach in approaches:
-            approaches[approach] = max(0.0, min(1.0, approaches[approach]))
-            
-        return approaches
+        return {key: max(0.0, min(1.0, value))
+                for key, value in zip(self.SANCTIONS_APPROACH_KEYS, values)}
     
     def alliance_compatibility(self, other_profile) -> float:
         """
@@ -221,33 +326,24 @@ class CountryProfile:
         Returns:
             Compatibility score (0.0-1.0) where higher means more compatible
         """
-        # Economic compatibility
-        economic_compatibility = 1.0 - (
-            abs(self.free_market_belief - other_profile.free_market_belief) * 0.3 +
-            abs(self.protectionism - other_profile.protectionism) * 0.3 +
-            abs(self.economic_focus - other_profile.economic_focus) * 0.2 +
-            abs(self.innovation_focus - other_profile.innovation_focus) * 0.2
-        ) / 1.0
-        
-        # Diplomatic compatibility
-        diplomatic_compatibility = 1.0 - (
-            abs(self.cooperation - other_profile.cooperation) * 0.3 +
-            abs(self.isolationism - other_profile.isolationism) * 0.2 +
-            abs(self.pragmatism - other_profile.pragmatism) * 0.3 +
-            abs(self.regional_focus - other_profile.regional_focus) * 0.2
-        ) / 1.0
-        
-        # Geopolitical compatibility
-        geopolitical_compatibility = 1.0 - (
-            abs(self.geopolitical_alignment - other_profile.geopolitical_alignment) * 0.6 +
-            abs(self.regional_leadership_role - other_profile.regional_leadership_role) * 0.4
-        ) / 1.0
-        
-        # Calculate overall compatibility with weighted components
-        overall_compatibility = (
-            economic_compatibility * 0.3 +
-            diplomatic_compatibility * 0.4 +
-            geopolitical_compatibility * 0.3
+        # Overall compatibility weights the economic (0.3), diplomatic (0.4) and
+        # geopolitical (0.3) components. Each component is 1.0 minus a weighted
+        # trait distance, and the component weights sum to 1.0, so the whole score
+        # folds into a single weighted distance with premultiplied trait weights:
+        #   economic:     free market 0.3, protectionism 0.3, economic focus 0.2, innovation 0.2
+        #   diplomatic:   cooperation 0.3, isolationism 0.2, pragmatism 0.3, regional focus 0.2
+        #   geopolitical: alignment 0.6, regional leadership 0.4
+        overall_compatibility = 1.0 - (
+            abs(self.free_market_belief - other_profile.free_market_belief) * 0.09 +
+            abs(self.protectionism - other_profile.protectionism) * 0.09 +
+            abs(self.economic_focus - other_profile.economic_focus) * 0.06 +
+            abs(self.innovation_focus - other_profile.innovation_focus) * 0.06 +
+            abs(self.cooperation - other_profile.cooperation) * 0.12 +
+            abs(self.isolationism - other_profile.isolationism) * 0.08 +
+            abs(self.pragmatism - other_profile.pragmatism) * 0.12 +
+            abs(self.regional_focus - other_profile.regional_focus) * 0.08 +
+            abs(self.geopolitical_alignment - other_profile.geopolitical_alignment) * 0.18 +
+            abs(self.regional_leadership_role - other_profile.regional_leadership_role) * 0.12
         )
         
         return max(0.0, min(1.0, overall_compatibility))
@@ -379,14 +475,12 @@ class CountryProfile:
                 self_env = self.environmental_policy.lower()
                 other_env = other_country.environmental_policy.lower()
                 
-                # Check for common environmental policy terms
-                common_terms = ["renewable", "sustainable", "climate", "green", "carbon"]
-                matches = 0
-                for term in common_terms:
-                    if (term in self_env) == (term in other_env):
-                        matches += 1
+                # Terms present in exactly one description count as mismatches
+                self_terms = frozenset(_ENV_TERMS_RE.findall(self_env))
+                other_terms = frozenset(_ENV_TERMS_RE.findall(other_env))
+                matches = len(_ENV_TERMS) - len(self_terms ^ other_terms)
                 
-                compatibility = 0.3 + (0.7 * (matches / len(common_terms)))
+                compatibility = 0.3 + (0.7 * (matches / len(_ENV_TERMS)))
         
         return min(max(compatibility, 0), 1)  # Ensure result is between 0 and 1
     
@@ -430,15 +524,14 @@ class CountryProfile:
         
         # Check for existing diplomatic incidents
         incident_modifier = 0
-        if hasattr(self, 'diplomatic_incidents') and isinstance(self.diplomatic_incidents, list):
-            # Look for incidents involving the other country
-            for incident in self.diplomatic_incidents:
-                if isinstance(incident, dict) and 'type' in incident:
-                    if incident.get('description', '').find(other_country.name) >= 0:
-                        if incident['type'] == 'cooperative':
-                            incident_modifier += 0.1
-                        elif incident['type'] == 'aggressive':
-                            incident_modifier -= 0.2
+        incidents = getattr(self, 'diplomatic_incidents', None)
+        other_name = getattr(other_country, 'name', None)
+        if isinstance(incidents, list) and incidents and other_name:
+            # Look for incidents whose description mentions the other country
+            for incident in incidents:
+                if (isinstance(incident, dict) and 'type' in incident
+                        and other_name in incident.get('description', '')):
+                    incident_modifier += _INCIDENT_MODIFIERS.get(incident['type'], 0)
             
             # Cap the modifier
             incident_modifier = max(min(incident_modifier, 0.3), -0.3)
@@ -471,6 +564,98 @@ class CountryProfile:
         
         return overall_score, factors
 
+def _get_relation_opinion(context, target, default=50):
+    """Look up the opinion toward target in an explanation context, or default if unknown."""
+    try:
+        return context['diplomatic']['relations'][target]['opinion']
+    except (KeyError, TypeError):
+        return default
+
+def _update_count(counts, key, change):
+    """Adjust a Counter entry, dropping it once it reaches zero."""
+    count = counts[key] + change
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+def _apply_reason_rules(reasons, profile, rules, values=None, limit=None, **fields):
+    """
+    Append the message of every rule whose value crosses its threshold.
+    
+    Args:
+        reasons: List of reasons to extend
+        profile: CountryProfile whose traits the rules test
+        rules: Sequence of (name, comparison, threshold, message) tuples
+        values: Optional context values (e.g. unemployment) tested by name
+                instead of a profile trait
+        limit: Optional number of reasons after which no more rules are evaluated
+        **fields: Extra values available to the %-style rule messages
+    """
+    for name, comparison, threshold, message in rules:
+        if limit is not None and len(reasons) >= limit:
+            break
+        if values is not None and name in values:
+            value = values[name]
+        else:
+            value = getattr(profile, name)
+        if (value > threshold) if comparison == '>' else (value < threshold):
+            fields['value'] = value
+            reasons.append(message % fields)
+
+# Reason placeholders filled from an explainer's reasons list, in order
+_REASON_FIELDS = ('primary_reason', 'secondary_reason', 'tertiary_reason')
+
+# Conversion functions for the !r, !s and !a format flags
+_CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+
+class ExplanationTemplate:
+    """
+    An explanation template parsed once into literal text and field names.
+    
+    Calling the template renders it like str.format with keyword arguments,
+    without re-parsing the format string on every render.
+    """
+    
+    __slots__ = ('text', 'parts', 'needed_fields', 'reason_count')
+    
+    def __init__(self, text: str):
+        self.text = text
+        # (literal, field or None, spec, conversion) in template order, as parsed
+        parts = tuple(string.Formatter().parse(text))
+        fields = [field for _literal, field, _spec, _conversion in parts if field is not None]
+        # Attribute/index lookups, auto-numbered fields and nested specs are
+        # rare; leave those templates to str.format itself
+        if all(field.isidentifier() and '{' not in spec
+               for _literal, field, spec, _conversion in parts if field is not None):
+            self.parts = parts
+        else:
+            self.parts = None
+        # Lets callers skip building values the template never substitutes
+        self.needed_fields = frozenset(fields)
+        # Reasons up to the last one the template shows; explainers stop collecting there
+        self.reason_count = max((index + 1 for index, field in enumerate(_REASON_FIELDS)
+                                 if field in self.needed_fields), default=0)
+    
+    def __call__(self, **kwargs) -> str:
+        if self.parts is None:
+            return self.text.format(**kwargs)
+        pieces = []
+        append = pieces.append
+        for literal, field, spec, conversion in self.parts:
+            # Fields next to each other or at the edges parse with empty literals
+            if literal:
+                append(literal)
+            if field is not None:
+                value = kwargs[field]
+                if conversion:
+                    value = _CONVERSIONS[conversion](value)
+                append(format(value, spec))
+        return "".join(pieces)
+    
+    def __repr__(self) -> str:
+        return f"ExplanationTemplate({self.text!r})"
+
 class AIExplanationSystem:
     """
     Provides detailed explanations of AI decision processes to increase transparency for players.
@@ -478,11 +663,273 @@ class AIExplanationSystem:
     diplomatic relations, and other contextual factors.
     """
     
-    def __init__(self, game_state=None):
-        """Initialize the explanation system."""
+    # Number of explanations retained per country
+    HISTORY_LIMIT = 200
+    
+    # Fallback reasons appended after profile-based ones, in template order
+    _DEFAULT_REASONS = {
+        "tariff": (
+            "General alignment with national economic strategy",
+            "Internal policy considerations",
+            "Domestic political factors"
+        ),
+        "subsidy": (
+            "Alignment with national economic priorities",
+            "Domestic economic considerations",
+            "Industry lobbying and political influence"
+        ),
+        "coalition_form": (
+            "Strategic alignment with national priorities",
+            "Alignment with strategic objectives"
+        ),
+        "coalition_join": (
+            "Alignment with national strategic interests",
+            "Diplomatic calculus favors membership"
+        ),
+        "coalition_leave": (
+            "Strategic realignment of foreign policy priorities",
+            "Shifting national priorities"
+        ),
+        "leadership_challenge": (
+            "Strategic reassessment of coalition leadership needs",
+            "Desire for greater influence"
+        ),
+        "diplomatic": (
+            "Alignment with strategic national interests",
+            "Changing geopolitical calculations"
+        ),
+        "budget": (
+            "Alignment with government fiscal priorities",
+            "Changing budget priorities"
+        )
+    }
+    
+    # Reason rules: (name, comparison, threshold, message). A rule adds its message
+    # when the named profile trait or context value crosses the threshold; messages
+    # are %-style and may use %(value) and any extra fields the explainer passes to
+    # _apply_reason_rules.
+    _TARIFF_INCREASE_RULES = (
+        ('protectionism', '>', 0.6, "Strong protectionist tendencies (Protectionism: %(value).1f)"),
+        ('sector_protection', '>', 0.7, "Policy of protecting domestic %(sector)s sector from foreign competition"),
+        ('unemployment', '>', 7, "High unemployment rate of %(value)s%% creates pressure to protect domestic jobs"),
+        ('retaliation', '>', 0.7, "Retaliation against %(target_name)s's trade policies (Retaliation tendency: %(value).1f)"),
+        ('economic_focus', '>', 0.7, "Prioritizing economic sovereignty over international cooperation")
+    )
+    _TARIFF_DECREASE_RULES = (
+        ('free_market_belief', '>', 0.7, "Strong free market ideology (Free market belief: %(value).1f)"),
+        ('export_orientation', '>', 0.7, "Export-oriented economic strategy that benefits from open markets"),
+        ('cooperation', '>', 0.7, "Commitment to international cooperation (Cooperation: %(value).1f)")
+    )
+    _SUBSIDY_RULES = (
+        ('sector_protection', '>', 0.6, "Strong belief in protecting key industries (Sector protection: %(value).1f)"),
+        ('self_sufficiency', '>', 0.7, "Strategic goal of self-sufficiency in %(sector)s"),
+        ('unemployment', '>', 6, "Need to preserve jobs in the %(sector)s sector amid %(value)s%% unemployment")
+    )
+    _INNOVATION_SUBSIDY_RULES = (
+        ('innovation_focus', '>', 0.7, "Strategic focus on technological innovation and advancement"),
+    )
+    _SUBSIDY_SECTOR_RULES = {
+        'technology': _INNOVATION_SUBSIDY_RULES,
+        'research': _INNOVATION_SUBSIDY_RULES,
+        'advanced_manufacturing': _INNOVATION_SUBSIDY_RULES
+    }
+    _FORMATION_PURPOSE_RULES = {
+        'trade': (
+            ('economic_focus', '>', 0.6, "Strong focus on economic interests (Economic focus: %(value).1f)"),
+            ('free_market_belief', '>', 0.6, "Belief in economic integration and free trade")
+        ),
+        'defense': (
+            ('aggression', '<', 0.4, "Defensive posture requires allies for security (Aggression: %(value).1f)"),
+            ('isolationism', '<', 0.4, "Recognition that security requires international partnerships")
+        ),
+        'regional': (
+            ('regional_focus', '>', 0.7, "Strong focus on regional affairs (Regional focus: %(value).1f)"),
+        ),
+        'counter': (
+            ('retaliation', '>', 0.6, "Tendency to counter perceived threats with alliances (Retaliation: %(value).1f)"),
+        )
+    }
+    _FORMATION_RULES = (
+        ('cooperation', '>', 0.6, "Strong cooperative approach to international relations"),
+        ('isolationism', '<', 0.3, "Internationalist outlook favors coalition-building")
+    )
+    _JOIN_PURPOSE_RULES = {
+        'trade': (
+            ('economic_focus', '>', 0.6, "Economic benefits of joining a trade-focused coalition"),
+            ('free_market_belief', '>', 0.6, "Alignment with free market principles of the coalition")
+        ),
+        'defense': (
+            ('aggression', '<', 0.4, "Security benefits of collective defense"),
+        ),
+        'regional': (
+            ('regional_focus', '>', 0.6, "Priority placed on regional integration and cooperation"),
+        )
+    }
+    _JOIN_RULES = (
+        ('isolationism', '<', 0.4, "Internationalist approach to foreign policy (Low isolationism: %(value).1f)"),
+        ('cooperation', '>', 0.6, "Strong cooperative tendencies in international affairs")
+    )
+    _LEAVE_RULES = (
+        ('isolationism', '>', 0.7, "Shift toward more independent foreign policy (High isolationism: %(value).1f)"),
+        ('pragmatism', '>', 0.7, "Pragmatic reassessment of the benefits of membership")
+    )
+    _CHALLENGE_RULES = (
+        ('pride', '>', 0.7, "National pride and ambition to lead (Pride: %(value).1f)"),
+        ('aggression', '>', 0.6, "Assertive foreign policy approach (Aggression: %(value).1f)")
+    )
+    _CHALLENGE_PURPOSE_RULES = {
+        'trade': _CHALLENGE_RULES[:1] + (
+            ('economic_focus', '>', 0.7, "Belief that %(country_name)s can better lead a trade-focused coalition"),
+        ) + _CHALLENGE_RULES[1:]
+    }
+    _IMPROVE_RELATIONS_RULES = (
+        ('cooperation', '>', 0.6, "General cooperative approach to diplomacy (Cooperation: %(value).1f)"),
+        ('economic_focus', '>', 0.6, "Economic benefits of stronger ties with %(target_name)s"),
+        ('relations', '<', 40, "Need to repair previously strained relations (Current relations: %(value)s/100)"),
+        ('pragmatism', '>', 0.7, "Pragmatic assessment that cooperation is beneficial")
+    )
+    _DETERIORATE_RELATIONS_RULES = (
+        ('aggression', '>', 0.6, "Assertive approach to international relations (Aggression: %(value).1f)"),
+        ('retaliation', '>', 0.7, "Response to perceived hostile actions by %(target_name)s")
+    )
+    _SPENDING_INCREASE_RULES = (
+        ('gdp_growth', '>', 2, "Strong economic growth of %(value)s%% enables increased spending"),
+    )
+    _SPENDING_INCREASE_CATEGORY_RULES = {
+        'education': (
+            ('innovation_focus', '>', 0.6, "Strong focus on innovation and human capital development"),
+        ) + _SPENDING_INCREASE_RULES,
+        'defense': (
+            ('aggression', '>', 0.6, "Assertive security posture requires increased military capabilities"),
+        ) + _SPENDING_INCREASE_RULES,
+        'infrastructure': (
+            ('economic_focus', '>', 0.7, "Priority on economic development through infrastructure investment"),
+        ) + _SPENDING_INCREASE_RULES,
+        'healthcare': (
+            ('accountability', '>', 0.7, "Strong commitment to public welfare and healthcare access"),
+        ) + _SPENDING_INCREASE_RULES,
+        'subsidies': _SPENDING_INCREASE_RULES + (
+            ('sector_protection', '>', 0.7, "Policy of protecting and supporting key economic sectors"),
+        )
+    }
+    _SPENDING_DECREASE_RULES = (
+        ('risk_aversion', '>', 0.7, "Conservative fiscal approach prioritizes deficit reduction"),
+        ('debt_tolerance', '<', 0.3, "Low tolerance for government debt (Debt tolerance: %(value).1f)"),
+        ('gdp_growth', '<', 0, "Economic contraction of %(contraction)s%% requires fiscal restraint")
+    )
+    _SPENDING_DECREASE_CATEGORY_RULES = {
+        'defense': (
+            ('aggression', '<', 0.3, "Peaceful foreign policy reduces need for military spending"),
+        )
+    }
+    
+    # Closing-line possibilities; only the randomly chosen one is formatted
+    _HISTORICAL_CONTEXTS = (
+        "Continuing a pattern of {purpose}-focused alliance-building",
+        "Response to changing global dynamics requiring new partnerships",
+        "Building on existing bilateral relationships to create a stronger multilateral framework",
+        "Evolution of informal cooperation into a formal structure"
+    )
+    _STRATEGIC_REASONS = (
+        "Coalition membership strengthens {country_name}'s international position",
+        "Joining provides access to new markets and resources",
+        "Membership offers protection against common rivals",
+        "Alignment with the coalition's goals serves national interests"
+    )
+    _CHANGED_CIRCUMSTANCES = (
+        "Domestic political pressures now favor withdrawal",
+        "The coalition's purpose has evolved away from {country_name}'s priorities",
+        "New bilateral relationships have diminished the value of multilateral cooperation",
+        "The international situation has changed, making membership less advantageous"
+    )
+    _POWER_DYNAMICS = (
+        "{country_name} has grown in influence while {target_name}'s has diminished",
+        "The coalition needs fresh leadership to address new challenges",
+        "Other member countries have encouraged {country_name} to step forward",
+        "Internal coalition dynamics have shifted in {country_name}'s favor"
+    )
+    _STRATEGY_REASONS = (
+        "Part of a broader diplomatic outreach strategy",
+        "Building alliances to counter regional rivals",
+        "Diversifying international partnerships",
+        "Preparing ground for future economic or security cooperation"
+    )
+    _CONFLICT_TOPICS = ('trade', 'security', 'regional influence')
+    _CONFLICT_REASONS = (
+        "Fundamental conflict of interests in {topic}",
+        "Ideological differences that have become increasingly prominent",
+        "Competition over resources or markets",
+        "Alignment with rival powers against {target_name}"
+    )
+    _ECONOMIC_CONTEXTS = (
+        "Taking advantage of a strong fiscal position to invest in {category}",
+        "Responding to public demand for improved {category} services",
+        "Strategic long-term investment in national capabilities",
+        "Part of a stimulus package to boost economic growth"
+    )
+    _FISCAL_REALITIES = (
+        "Budget constraints require reallocation of resources away from {category}",
+        "Fiscal consolidation necessary to maintain economic stability",
+        "Shift in priorities toward more pressing national needs",
+        "Efficiency measures aimed at reducing waste while maintaining services"
+    )
+    
+    # Explainer method for each decision type handled by explain_decision
+    _DECISION_EXPLAINERS = {
+        "trade": "_explain_trade_decision",
+        "coalition": "_explain_coalition_decision",
+        "diplomatic": "_explain_diplomatic_decision",
+        "budget": "_explain_budget_decision"
+    }
+    
+    # Explainer method for each coalition action handled by _explain_coalition_decision
+    _COALITION_EXPLAINERS = {
+        "form_coalition": "_explain_coalition_formation",
+        "join_coalition": "_explain_coalition_join",
+        "leave_coalition": "_explain_coalition_leave",
+        "challenge_leadership": "_explain_leadership_challenge"
+    }
+    
+    def __init__(self, game_state=None, explanations_enabled=True):
+        """
+        Initialize the explanation system.
+        
+        Args:
+            game_state: Game state to explain decisions against (optional)
+            explanations_enabled: When False, explain_decision records decisions and
+                                  returns a short summary; full explanations are
+                                  generated on first request
+        """
         self.game_state = game_state
+        self.explanations_enabled = explanations_enabled
+        self._countries = None
+        self._diplomacy = None
+        self.refresh()
         self.explanation_templates = self._load_explanation_templates()
-        self.explanation_history = {}  # Track explanations by country and turn
+        self._compiled_templates = {
+            category: {key: [ExplanationTemplate(text) for text in texts]
+                       for key, texts in templates.items()}
+            for category, templates in self.explanation_templates.items()
+        }
+        # Track explanations by country and turn, keeping only the most recent ones
+        self.explanation_history = defaultdict(lambda: deque(maxlen=self.HISTORY_LIMIT))
+        # Report statistics over each country's retained history, kept up to date on record
+        self.decision_counts = defaultdict(Counter)
+        self.diplomatic_targets = defaultdict(Counter)
+        # History entries by decision_id, while still in history
+        self._entries = {}
+        self._decision_ids = itertools.count(1)
+        
+    def refresh(self):
+        """
+        Re-resolve references into the game state.
+        
+        Called before every explanation and report, so countries or diplomacy
+        objects the engine reassigns on the game state are picked up.
+        """
+        countries = getattr(self.game_state, 'countries', None)
+        self._countries = _NO_COUNTRIES if countries is None else countries
+        self._diplomacy = getattr(self.game_state, 'diplomacy', None)
         
     def _load_explanation_templates(self):
         """Load templates for various types of explanations."""
@@ -574,11 +1021,43 @@ class AIExplanationSystem:
             game_state: Current game state (optional - will use stored state if not provided)
             
         Returns:
-            A human-readable explanation of the decision with context
+            A human-readable explanation of the decision with context. When
+            explanations are disabled, the decision is recorded for later
+            generation and a short summary is returned instead
         """
         if game_state:
             self.game_state = game_state
+        
+        if not self.explanations_enabled:
+            self._record_explanation(country_iso, decision_type, decision_details, None)
+            return self._generate_simple_explanation(country_iso, decision_type, decision_details)
+        
+        explanation = self._generate_explanation(country_iso, decision_type, decision_details)
+        self._record_explanation(country_iso, decision_type, decision_details, explanation)
+        return explanation
+    
+    def record_decision(self, country_iso, decision_type, decision_details, game_state=None):
+        """
+        Record a decision without generating its explanation.
+        
+        Args:
+            country_iso: ISO code of the country
+            decision_type: Type of decision (trade, coalition, diplomatic, budget)
+            decision_details: Dictionary with decision details
+            game_state: Current game state (optional - will use stored state if not provided)
             
+        Returns:
+            The decision_id to pass to get_explanation
+        """
+        if game_state:
+            self.game_state = game_state
+        
+        return self._record_explanation(country_iso, decision_type, decision_details, None)['decision_id']
+    
+    def _generate_explanation(self, country_iso, decision_type, decision_details):
+        """Build the explanation text for a decision against the current game state."""
+        self.refresh()
+        
         # If game state is still None, we can't generate context-aware explanations
         if not self.game_state:
             return self._generate_simple_explanation(country_iso, decision_type, decision_details)
@@ -588,30 +1067,89 @@ class AIExplanationSystem:
         country_context = self._analyze_country_context(country_iso)
         
         # Generate specific explanation based on decision type
-        if decision_type == "trade":
-            explanation = self._explain_trade_decision(country_iso, country_profile, country_context, decision_details)
-        elif decision_type == "coalition":
-            explanation = self._explain_coalition_decision(country_iso, country_profile, country_context, decision_details)
-        elif decision_type == "diplomatic":
-            explanation = self._explain_diplomatic_decision(country_iso, country_profile, country_context, decision_details)
-        elif decision_type == "budget":
-            explanation = self._explain_budget_decision(country_iso, country_profile, country_context, decision_details)
+        method_name = self._DECISION_EXPLAINERS.get(decision_type)
+        if method_name:
+            explanation = getattr(self, method_name)(country_iso, country_profile, country_context, decision_details)
         else:
             explanation = self._generate_simple_explanation(country_iso, decision_type, decision_details)
         
-        # Store in history
-        current_turn = getattr(self.game_state, 'current_turn', 0)
-        if country_iso not in self.explanation_history:
-            self.explanation_history[country_iso] = []
-            
-        self.explanation_history[country_iso].append({
-            'turn': current_turn,
+        return explanation
+    
+    def _record_explanation(self, country_iso, decision_type, decision_details, explanation):
+        """Store a decision in the history and return its entry; a None explanation is generated on request."""
+        history = self.explanation_history[country_iso]
+        if len(history) == history.maxlen:
+            # The oldest entry is about to drop out of the history
+            oldest = history[0]
+            self._tally_explanation(country_iso, oldest, -1)
+            del self._entries[oldest['decision_id']]
+        
+        entry = {
+            'country': country_iso,
+            'decision_id': next(self._decision_ids),
+            'turn': getattr(self.game_state, 'current_turn', 0),
             'type': decision_type,
             'details': decision_details,
             'explanation': explanation
-        })
+        }
+        history.append(entry)
+        self._tally_explanation(country_iso, entry, 1)
+        self._entries[entry['decision_id']] = entry
+        return entry
+    
+    def _tally_explanation(self, country_iso, entry, change):
+        """Add (change=1) or remove (change=-1) a history entry from the report statistics."""
+        decision_type = entry.get('type', 'unknown')
+        _update_count(self.decision_counts[country_iso], decision_type, change)
+        if decision_type == 'diplomatic':
+            target = entry.get('details', {}).get('target_country')
+            if target:
+                _update_count(self.diplomatic_targets[country_iso], target, change)
+    
+    def get_explanation(self, decision_id):
+        """
+        Get the explanation of a recorded decision, generating it on first request.
         
-        return explanation
+        Deferred explanations are generated against the game state current at the
+        time of the request, then stored on the history entry.
+        
+        Args:
+            decision_id: The decision_id of a history entry
+            
+        Returns:
+            The explanation, or None if the decision is no longer in the history
+        """
+        entry = self._entries.get(decision_id)
+        if entry is None:
+            return None
+        if entry['explanation'] is None:
+            entry['explanation'] = self._generate_explanation(entry['country'], entry['type'], entry['details'])
+        return entry['explanation']
+
+    def explain_decisions(self, decisions, game_state=None):
+        """
+        Generate explanations for a batch of decisions, e.g. all AI moves of a turn.
+
+        Args:
+            decisions: Iterable of (country_iso, decision_type, decision_details) tuples
+            game_state: Current game state (optional - will use stored state if not provided)
+
+        Returns:
+            List of explanations in the same order as the decisions
+        """
+        if game_state:
+            self.game_state = game_state
+
+        explain = self.explain_decision
+        return [explain(country_iso, decision_type, decision_details)
+                for country_iso, decision_type, decision_details in decisions]
+
+    def _select_template(self, category, template_key):
+        """Pick a compiled explanation template, skipping the random draw when there is only one."""
+        templates = self._compiled_templates[category][template_key]
+        if len(templates) == 1:
+            return templates[0]
+        return random.choice(templates)
     
     def _generate_simple_explanation(self, country_iso, decision_type, decision_details):
         """Generate a simple explanation when context is limited."""
@@ -619,21 +1157,21 @@ class AIExplanationSystem:
         target = decision_details.get('target_country', '')
         explanation = decision_details.get('explanation', '')
         
-        return f"{country_iso} took {action} {('toward ' + target) if target else ''}: {explanation}"
+        if target:
+            return f"{country_iso} took {action} toward {target}: {explanation}"
+        return f"{country_iso} took {action}: {explanation}"
     
     def _get_country_profile(self, country_iso):
         """Get the country profile for generating explanations."""
         # Try to get from game state
-        if hasattr(self.game_state, 'countries') and country_iso in self.game_state.countries:
-            country = self.game_state.countries[country_iso]
-            if hasattr(country, 'profile'):
-                return country.profile
+        country = self._countries.get(country_iso)
+        if country is not None and hasattr(country, 'profile'):
+            return country.profile
                 
         # Try to get from diplomacy system
-        if hasattr(self.game_state, 'diplomacy'):
-            diplomacy = self.game_state.diplomacy
-            if hasattr(diplomacy, 'country_personalities') and country_iso in diplomacy.country_personalities:
-                return diplomacy.country_personalities[country_iso]
+        personalities = getattr(self._diplomacy, 'country_personalities', None)
+        if personalities is not None and country_iso in personalities:
+            return personalities[country_iso]
         
         # Default to a neutral profile if nothing found
         return CountryProfile()
@@ -647,32 +1185,23 @@ class AIExplanationSystem:
         }
         
         # Get economic data
-        if hasattr(self.game_state, 'countries') and country_iso in self.game_state.countries:
-            country = self.game_state.countries[country_iso]
-            
-            # Economic indicators
-            if hasattr(country, 'gdp'):
-                context['economic']['gdp'] = country.gdp
-            if hasattr(country, 'gdp_growth'):
-                context['economic']['gdp_growth'] = country.gdp_growth
-            if hasattr(country, 'unemployment_rate'):
-                context['economic']['unemployment'] = country.unemployment_rate
-            if hasattr(country, 'inflation'):
-                context['economic']['inflation'] = country.inflation
-                
-            # Domestic situation
-            if hasattr(country, 'approval_rating'):
-                context['domestic']['approval'] = country.approval_rating
-            if hasattr(country, 'stability'):
-                context['domestic']['stability'] = country.stability
+        country = self._countries.get(country_iso)
+        if country is not None:
+            # Economic indicators and domestic situation
+            for section, fields in _COUNTRY_CONTEXT_FIELDS:
+                section_context = context[section]
+                for attr, key in fields:
+                    value = getattr(country, attr, _MISSING)
+                    if value is not _MISSING:
+                        section_context[key] = value
         
         # Get diplomatic context
-        if hasattr(self.game_state, 'diplomacy'):
-            diplomacy = self.game_state.diplomacy
-            
+        diplomacy = self._diplomacy
+        if diplomacy is not None:
             # Relations with other countries
-            if hasattr(diplomacy, 'country_relations') and country_iso in diplomacy.country_relations:
-                context['diplomatic']['relations'] = diplomacy.country_relations[country_iso]
+            relations = getattr(diplomacy, 'country_relations', None)
+            if relations is not None and country_iso in relations:
+                context['diplomatic']['relations'] = relations[country_iso]
             
             # Coalition memberships
             if hasattr(diplomacy, 'get_active_coalitions'):
@@ -705,8 +1234,7 @@ class AIExplanationSystem:
         
         # Select template
         template_key = "tariff_increase" if increase else "tariff_decrease"
-        templates = self.explanation_templates["trade"][template_key]
-        template = random.choice(templates)
+        template = self._select_template("trade", template_key)
         
         # Generate reasons based on country profile and context
         reasons = []
@@ -715,45 +1243,27 @@ class AIExplanationSystem:
         economic_context = context.get('economic', {})
         if increase:
             # Reasons for increasing tariffs
-            if profile.protectionism > 0.6:
-                reasons.append(f"Strong protectionist tendencies (Protectionism: {profile.protectionism:.1f})")
-            
-            if profile.sector_protection > 0.7:
-                reasons.append(f"Policy of protecting domestic {sector} sector from foreign competition")
-            
-            if economic_context.get('unemployment', 0) > 7:
-                reasons.append(f"High unemployment rate of {economic_context.get('unemployment')}% creates pressure to protect domestic jobs")
-                
-            if profile.retaliation > 0.7:
-                reasons.append(f"Retaliation against {target_name}'s trade policies (Retaliation tendency: {profile.retaliation:.1f})")
-                
-            if profile.economic_focus > 0.7:
-                reasons.append(f"Prioritizing economic sovereignty over international cooperation")
+            _apply_reason_rules(reasons, profile, self._TARIFF_INCREASE_RULES,
+                                values={'unemployment': economic_context.get('unemployment', 0)},
+                                sector=sector, target_name=target_name, limit=template.reason_count)
         else:
             # Reasons for decreasing tariffs
-            if profile.free_market_belief > 0.7:
-                reasons.append(f"Strong free market ideology (Free market belief: {profile.free_market_belief:.1f})")
-                
-            if profile.export_orientation > 0.7:
-                reasons.append(f"Export-oriented economic strategy that benefits from open markets")
-                
-            if profile.cooperation > 0.7:
-                reasons.append(f"Commitment to international cooperation (Cooperation: {profile.cooperation:.1f})")
+            _apply_reason_rules(reasons, profile, self._TARIFF_DECREASE_RULES,
+                                limit=template.reason_count)
                 
-            relations = context.get('diplomatic', {}).get('relations', {}).get(target_country, {}).get('opinion', 50)
-            if relations > 70:
+            relations = _get_relation_opinion(context, target_country)
+            if relations > 70 and len(reasons) < template.reason_count:
                 reasons.append(f"Excellent diplomatic relations with {target_name} (Relations: {relations}/100)")
         
-        # Fill in the template
-        while len(reasons) < 3:
-            reasons.append("General alignment with national economic strategy")
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["tariff"])
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             target_country=target_name,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Internal policy considerations",
-            tertiary_reason=reasons[2] if len(reasons) > 2 else "Domestic political factors"
+            secondary_reason=reasons[1],
+            tertiary_reason=reasons[2]
         )
         
         return explanation
@@ -767,52 +1277,37 @@ class AIExplanationSystem:
         country_name = self._get_country_name(country_iso)
         
         # Select template
-        template = random.choice(self.explanation_templates["trade"]["subsidy"])
+        template = self._select_template("trade", "subsidy")
         
         # Generate reasons based on profile and context
         reasons = []
         
-        if profile.sector_protection > 0.6:
-            reasons.append(f"Strong belief in protecting key industries (Sector protection: {profile.sector_protection:.1f})")
-            
-        if profile.self_sufficiency > 0.7:
-            reasons.append(f"Strategic goal of self-sufficiency in {sector}")
-            
         economic_context = context.get('economic', {})
-        if economic_context.get('unemployment', 0) > 6:
-            reasons.append(f"Need to preserve jobs in the {sector} sector amid {economic_context.get('unemployment')}% unemployment")
+        _apply_reason_rules(reasons, profile, self._SUBSIDY_RULES,
+                            values={'unemployment': economic_context.get('unemployment', 0)},
+                            sector=sector, limit=template.reason_count)
+        _apply_reason_rules(reasons, profile, self._SUBSIDY_SECTOR_RULES.get(sector, ()),
+                            limit=template.reason_count)
             
-        if profile.innovation_focus > 0.7 and sector in ['technology', 'research', 'advanced_manufacturing']:
-            reasons.append(f"Strategic focus on technological innovation and advancement")
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["subsidy"])
             
-        # Fill in the template
-        while len(reasons) < 3:
-            reasons.append("Alignment with national economic priorities")
-            
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             sector=sector,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Domestic economic considerations",
-            tertiary_reason=reasons[2] if len(reasons) > 2 else "Industry lobbying and political influence"
+            secondary_reason=reasons[1],
+            tertiary_reason=reasons[2]
         )
         
         return explanation
     
     def _explain_coalition_decision(self, country_iso, profile, context, decision_details):
         """Generate explanations for coalition-related decisions."""
-        action = decision_details.get('action', '')
-        
-        if action == 'form_coalition':
-            return self._explain_coalition_formation(country_iso, profile, context, decision_details)
-        elif action == 'join_coalition':
-            return self._explain_coalition_join(country_iso, profile, context, decision_details)
-        elif action == 'leave_coalition':
-            return self._explain_coalition_leave(country_iso, profile, context, decision_details)
-        elif action == 'challenge_leadership':
-            return self._explain_leadership_challenge(country_iso, profile, context, decision_details)
-        else:
-            return self._generate_simple_explanation(country_iso, 'coalition', decision_details)
+        method_name = self._COALITION_EXPLAINERS.get(decision_details.get('action', ''))
+        if method_name:
+            return getattr(self, method_name)(country_iso, profile, context, decision_details)
+        return self._generate_simple_explanation(country_iso, 'coalition', decision_details)
     
     def _explain_coalition_formation(self, country_iso, profile, context, decision_details):
         """Explain a coalition formation decision."""
@@ -825,61 +1320,31 @@ class AIExplanationSystem:
         country_name = self._get_country_name(country_iso)
         
         # Select template
-        template = random.choice(self.explanation_templates["coalition"]["form"])
+        template = self._select_template("coalition", "form")
         
         # Generate reasons based on profile and context
         reasons = []
         
         # Purpose-specific reasons
-        if purpose == 'trade':
-            if profile.economic_focus > 0.6:
-                reasons.append(f"Strong focus on economic interests (Economic focus: {profile.economic_focus:.1f})")
-            if profile.free_market_belief > 0.6:
-                reasons.append(f"Belief in economic integration and free trade")
-                
-        elif purpose == 'defense':
-            if profile.aggression < 0.4:
-                reasons.append(f"Defensive posture requires allies for security (Aggression: {profile.aggression:.1f})")
-            if profile.isolationism < 0.4:
-                reasons.append(f"Recognition that security requires international partnerships")
-                
-        elif purpose == 'regional':
-            if profile.regional_focus > 0.7:
-                reasons.append(f"Strong focus on regional affairs (Regional focus: {profile.regional_focus:.1f})")
-                
-        elif purpose == 'counter':
-            if profile.retaliation > 0.6:
-                reasons.append(f"Tendency to counter perceived threats with alliances (Retaliation: {profile.retaliation:.1f})")
+        _apply_reason_rules(reasons, profile, self._FORMATION_PURPOSE_RULES.get(purpose, ()),
+                            limit=template.reason_count)
         
         # General coalition-forming reasons
-        if profile.cooperation > 0.6:
-            reasons.append(f"Strong cooperative approach to international relations")
-        
-        if profile.isolationism < 0.3:
-            reasons.append(f"Internationalist outlook favors coalition-building")
+        _apply_reason_rules(reasons, profile, self._FORMATION_RULES, limit=template.reason_count)
         
         # Strategic context
         if len(candidates) > 2:
             reasons.append(f"Opportunity to form a powerful bloc with {len(candidates)} like-minded countries")
         
-        # Historical context possibilities
-        historical_contexts = [
-            f"Continuing a pattern of {purpose}-focused alliance-building",
-            f"Response to changing global dynamics requiring new partnerships",
-            f"Building on existing bilateral relationships to create a stronger multilateral framework",
-            f"Evolution of informal cooperation into a formal structure"
-        ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Strategic alignment with national priorities")
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["coalition_form"])
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             purpose=purpose,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Alignment with strategic objectives",
-            historical_context=random.choice(historical_contexts)
+            secondary_reason=reasons[1],
+            historical_context=random.choice(self._HISTORICAL_CONTEXTS).format(purpose=purpose)
         )
         
         return explanation
@@ -896,62 +1361,37 @@ class AIExplanationSystem:
         country_name = self._get_country_name(country_iso)
         
         # Select template
-        template = random.choice(self.explanation_templates["coalition"]["join"])
+        template = self._select_template("coalition", "join")
         
         # Generate reasons based on profile and context
         reasons = []
         
         # Purpose-specific reasons based on coalition type
         purpose = coalition_details.get('purpose', '')
-        if purpose == 'trade':
-            if profile.economic_focus > 0.6:
-                reasons.append(f"Economic benefits of joining a trade-focused coalition")
-            if profile.free_market_belief > 0.6:
-                reasons.append(f"Alignment with free market principles of the coalition")
-                
-        elif purpose == 'defense':
-            if profile.aggression < 0.4:
-                reasons.append(f"Security benefits of collective defense")
-                
-        elif purpose == 'regional':
-            if profile.regional_focus > 0.6:
-                reasons.append(f"Priority placed on regional integration and cooperation")
+        _apply_reason_rules(reasons, profile, self._JOIN_PURPOSE_RULES.get(purpose, ()),
+                            limit=template.reason_count)
                 
         # Leader-based reasons
         leader_country = coalition_details.get('leader_country', '')
         if leader_country:
             leader_name = self._get_country_name(leader_country)
-            diplomatic_context = context.get('diplomatic', {})
-            relations = diplomatic_context.get('relations', {}).get(leader_country, {}).get('opinion', 50)
+            relations = _get_relation_opinion(context, leader_country)
             
             if relations > 70:
                 reasons.append(f"Strong relations with coalition leader {leader_name} (Relations: {relations}/100)")
         
         # General coalition-joining reasons
-        if profile.isolationism < 0.4:
-            reasons.append(f"Internationalist approach to foreign policy (Low isolationism: {profile.isolationism:.1f})")
-            
-        if profile.cooperation > 0.6:
-            reasons.append(f"Strong cooperative tendencies in international affairs")
-        
-        # Strategic alignment possibilities
-        strategic_reasons = [
-            f"Coalition membership strengthens {country_name}'s international position",
-            f"Joining provides access to new markets and resources",
-            f"Membership offers protection against common rivals",
-            f"Alignment with the coalition's goals serves national interests"
-        ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Alignment with national strategic interests")
+        _apply_reason_rules(reasons, profile, self._JOIN_RULES, limit=template.reason_count)
+        
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["coalition_join"])
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             coalition_name=coalition_name,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Diplomatic calculus favors membership",
-            strategic_reason=random.choice(strategic_reasons)
+            secondary_reason=reasons[1],
+            strategic_reason=random.choice(self._STRATEGIC_REASONS).format(country_name=country_name)
         )
         
         return explanation
@@ -969,7 +1409,7 @@ class AIExplanationSystem:
         country_name = self._get_country_name(country_iso)
         
         # Select template
-        template = random.choice(self.explanation_templates["coalition"]["leave"])
+        template = self._select_template("coalition", "leave")
         
         # Generate reasons based on profile, context, and stated reason
         reasons = []
@@ -992,30 +1432,17 @@ class AIExplanationSystem:
             reasons.append(f"Conflicts with other member countries have become untenable")
             
         # Profile-based reasons
-        if profile.isolationism > 0.7:
-            reasons.append(f"Shift toward more independent foreign policy (High isolationism: {profile.isolationism:.1f})")
-            
-        if profile.pragmatism > 0.7:
-            reasons.append(f"Pragmatic reassessment of the benefits of membership")
-            
-        # Changed circumstances possibilities
-        changed_circumstances = [
-            f"Domestic political pressures now favor withdrawal",
-            f"The coalition's purpose has evolved away from {country_name}'s priorities",
-            f"New bilateral relationships have diminished the value of multilateral cooperation",
-            f"The international situation has changed, making membership less advantageous"
-        ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Strategic realignment of foreign policy priorities")
+        _apply_reason_rules(reasons, profile, self._LEAVE_RULES, limit=template.reason_count)
+        
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["coalition_leave"])
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             coalition_name=coalition_name,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Shifting national priorities",
-            changed_circumstance=random.choice(changed_circumstances)
+            secondary_reason=reasons[1],
+            changed_circumstance=random.choice(self._CHANGED_CIRCUMSTANCES).format(country_name=country_name)
         )
         
         return explanation
@@ -1036,47 +1463,33 @@ class AIExplanationSystem:
         target_name = self._get_country_name(leader_country) if leader_country else "the current leader"
         
         # Select template
-        template = random.choice(self.explanation_templates["coalition"]["challenge_leadership"])
+        template = self._select_template("coalition", "challenge_leadership")
         
         # Generate reasons based on profile and context
         reasons = []
         
-        if profile.pride > 0.7:
-            reasons.append(f"National pride and ambition to lead (Pride: {profile.pride:.1f})")
-            
-        if profile.economic_focus > 0.7 and coalition_details.get('purpose') == 'trade':
-            reasons.append(f"Belief that {country_name} can better lead a trade-focused coalition")
-            
-        if profile.aggression > 0.6:
-            reasons.append(f"Assertive foreign policy approach (Aggression: {profile.aggression:.1f})")
+        challenge_rules = self._CHALLENGE_PURPOSE_RULES.get(coalition_details.get('purpose'), self._CHALLENGE_RULES)
+        _apply_reason_rules(reasons, profile, challenge_rules, country_name=country_name,
+                            limit=template.reason_count)
             
         # Leader-specific reasons
         if leader_country:
-            diplomatic_context = context.get('diplomatic', {})
-            relations = diplomatic_context.get('relations', {}).get(leader_country, {}).get('opinion', 50)
+            relations = _get_relation_opinion(context, leader_country)
             
             if relations < 40:
                 reasons.append(f"Poor relations with current leader {target_name} (Relations: {relations}/100)")
         
-        # Power dynamics possibilities
-        power_dynamics = [
-            f"{country_name} has grown in influence while {target_name}'s has diminished",
-            f"The coalition needs fresh leadership to address new challenges",
-            f"Other member countries have encouraged {country_name} to step forward",
-            f"Internal coalition dynamics have shifted in {country_name}'s favor"
-        ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Strategic reassessment of coalition leadership needs")
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["leadership_challenge"])
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             target_country=target_name,
             coalition_name=coalition_name,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Desire for greater influence",
-            power_dynamics=random.choice(power_dynamics)
+            secondary_reason=reasons[1],
+            power_dynamics=random.choice(self._POWER_DYNAMICS).format(country_name=country_name,
+                                                                      target_name=target_name)
         )
         
         return explanation
@@ -1098,66 +1511,49 @@ class AIExplanationSystem:
         target_name = self._get_country_name(target_country)
         
         # Select template
-        template = random.choice(self.explanation_templates["diplomatic"][template_key])
+        template = self._select_template("diplomatic", template_key)
         
         # Generate reasons based on profile and context
         reasons = []
         
         # Get current relations if available
-        diplomatic_context = context.get('diplomatic', {})
-        current_relations = diplomatic_context.get('relations', {}).get(target_country, {}).get('opinion', 50)
+        current_relations = _get_relation_opinion(context, target_country)
         
         if is_improving:
             # Reasons for improving relations
-            if profile.cooperation > 0.6:
-                reasons.append(f"General cooperative approach to diplomacy (Cooperation: {profile.cooperation:.1f})")
-                
-            if profile.economic_focus > 0.6:
-                reasons.append(f"Economic benefits of stronger ties with {target_name}")
-                
-            if current_relations < 40:
-                reasons.append(f"Need to repair previously strained relations (Current relations: {current_relations}/100)")
-                
-            if profile.pragmatism > 0.7:
-                reasons.append(f"Pragmatic assessment that cooperation is beneficial")
-                
-            # Strategy reasons
-            strategy_reasons = [
-                f"Part of a broader diplomatic outreach strategy",
-                f"Building alliances to counter regional rivals",
-                f"Diversifying international partnerships",
-                f"Preparing ground for future economic or security cooperation"
-            ]
+            _apply_reason_rules(reasons, profile, self._IMPROVE_RELATIONS_RULES,
+                                values={'relations': current_relations},
+                                target_name=target_name, limit=template.reason_count)
         else:
             # Reasons for deteriorating relations
-            if profile.aggression > 0.6:
-                reasons.append(f"Assertive approach to international relations (Aggression: {profile.aggression:.1f})")
-                
-            if profile.retaliation > 0.7:
-                reasons.append(f"Response to perceived hostile actions by {target_name}")
+            _apply_reason_rules(reasons, profile, self._DETERIORATE_RELATIONS_RULES, target_name=target_name,
+                                limit=template.reason_count)
                 
-            if profile.pride > 0.7 and current_relations < 50:
-                reasons.append(f"Pride and unwillingness to overlook past slights (Pride: {profile.pride:.1f})")
+            pride = profile.pride
+            if pride > 0.7 and current_relations < 50:
+                reasons.append("Pride and unwillingness to overlook past slights (Pride: %.1f)" % pride)
                 
-            # Conflict reasons
-            conflict_reasons = [
-                f"Fundamental conflict of interests in {random.choice(['trade', 'security', 'regional influence'])}",
-                f"Ideological differences that have become increasingly prominent",
-                f"Competition over resources or markets",
-                f"Alignment with rival powers against {target_name}"
-            ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Alignment with strategic national interests")
+            # Conflict topic, drawn before the closing reason is chosen
+            conflict_topic = random.choice(self._CONFLICT_TOPICS)
+        
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["diplomatic"])
+        
+        # Only draw the closing reason the selected template actually uses
+        situation = {}
+        if is_improving:
+            if 'strategy_reason' in template.needed_fields:
+                situation['strategy_reason'] = random.choice(self._STRATEGY_REASONS)
+        elif 'conflict_reason' in template.needed_fields:
+            situation['conflict_reason'] = random.choice(self._CONFLICT_REASONS).format(
+                topic=conflict_topic, target_name=target_name)
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             target_country=target_name,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Changing geopolitical calculations",
-            strategy_reason=random.choice(strategy_reasons) if is_improving else "N/A",
-            conflict_reason=random.choice(conflict_reasons) if not is_improving else "N/A"
+            secondary_reason=reasons[1],
+            **situation
         )
         
         return explanation
@@ -1175,7 +1571,7 @@ class AIExplanationSystem:
         country_name = self._get_country_name(country_iso)
         
         # Select template
-        template = random.choice(self.explanation_templates["budget"][template_key])
+        template = self._select_template("budget", template_key)
         
         # Generate reasons based on profile and context
         reasons = []
@@ -1183,63 +1579,36 @@ class AIExplanationSystem:
         
         if is_increase:
             # Reasons for increasing spending
-            if category == 'education' and profile.innovation_focus > 0.6:
-                reasons.append(f"Strong focus on innovation and human capital development")
-                
-            elif category == 'defense' and profile.aggression > 0.6:
-                reasons.append(f"Assertive security posture requires increased military capabilities")
-                
-            elif category == 'infrastructure' and profile.economic_focus > 0.7:
-                reasons.append(f"Priority on economic development through infrastructure investment")
-                
-            elif category == 'healthcare' and profile.accountability > 0.7:
-                reasons.append(f"Strong commitment to public welfare and healthcare access")
-                
-            # General economic context
-            if economic_context.get('gdp_growth', 0) > 2:
-                reasons.append(f"Strong economic growth of {economic_context.get('gdp_growth')}% enables increased spending")
-                
-            if category == 'subsidies' and profile.sector_protection > 0.7:
-                reasons.append(f"Policy of protecting and supporting key economic sectors")
-                
-            economic_contexts = [
-                f"Taking advantage of a strong fiscal position to invest in {category}",
-                f"Responding to public demand for improved {category} services",
-                f"Strategic long-term investment in national capabilities",
-                f"Part of a stimulus package to boost economic growth"
-            ]
+            # Category-specific reasons and general economic context
+            _apply_reason_rules(reasons, profile,
+                                self._SPENDING_INCREASE_CATEGORY_RULES.get(category, self._SPENDING_INCREASE_RULES),
+                                values={'gdp_growth': economic_context.get('gdp_growth', 0)}, limit=template.reason_count)
         else:
             # Reasons for decreasing spending
-            if profile.risk_aversion > 0.7:
-                reasons.append(f"Conservative fiscal approach prioritizes deficit reduction")
-                
-            if profile.debt_tolerance < 0.3:
-                reasons.append(f"Low tolerance for government debt (Debt tolerance: {profile.debt_tolerance:.1f})")
-                
-            if economic_context.get('gdp_growth', 0) < 0:
-                reasons.append(f"Economic contraction of {abs(economic_context.get('gdp_growth', 0))}% requires fiscal restraint")
-                
-            if category == 'defense' and profile.aggression < 0.3:
-                reasons.append(f"Peaceful foreign policy reduces need for military spending")
-                
-            fiscal_realities = [
-                f"Budget constraints require reallocation of resources away from {category}",
-                f"Fiscal consolidation necessary to maintain economic stability",
-                f"Shift in priorities toward more pressing national needs",
-                f"Efficiency measures aimed at reducing waste while maintaining services"
-            ]
-        
-        # Fill in the template
-        while len(reasons) < 2:
-            reasons.append("Alignment with government fiscal priorities")
+            gdp_growth = economic_context.get('gdp_growth', 0)
+            _apply_reason_rules(reasons, profile, self._SPENDING_DECREASE_RULES,
+                                values={'gdp_growth': gdp_growth},
+                                contraction=abs(gdp_growth), limit=template.reason_count)
+            _apply_reason_rules(reasons, profile, self._SPENDING_DECREASE_CATEGORY_RULES.get(category, ()),
+                                limit=template.reason_count)
+        
+        # Pad with fallback reasons and fill in the template
+        reasons.extend(self._DEFAULT_REASONS["budget"])
+        
+        # Only draw the closing reason the selected template actually uses
+        situation = {}
+        if is_increase:
+            if 'economic_context' in template.needed_fields:
+                situation['economic_context'] = random.choice(self._ECONOMIC_CONTEXTS).format(category=category)
+        elif 'fiscal_reality' in template.needed_fields:
+            situation['fiscal_reality'] = random.choice(self._FISCAL_REALITIES).format(category=category)
             
-        explanation = template.format(
+        explanation = template(
             country=country_name,
             category=category,
             primary_reason=reasons[0],
-            secondary_reason=reasons[1] if len(reasons) > 1 else "Changing budget priorities",
-            economic_context=random.choice(economic_contexts) if is_increase else "N/A",
-            fiscal_reality=random.choice(fiscal_realities) if not is_increase else "N/A"
+            secondary_reason=reasons[1],
+            **situation
         )
         
         return explanation
@@ -1248,59 +1617,38 @@ class AIExplanationSystem:
         """Get the full name of a country from its ISO code."""
         if not country_iso:
             return "Unknown country"
-            
-        if hasattr(self.game_state, 'countries') and country_iso in self.game_state.countries:
-            country = self.game_state.countries[country_iso]
-            if hasattr(country, 'name'):
-                return country.name
+        
+        country = self._countries.get(country_iso)
+        if country is not None and hasattr(country, 'name'):
+            return country.name
                 
         # Common countries fallback
-        country_names = {
-            'US': 'United States',
-            'CN': 'China',
-            'RU': 'Russia',
-            'DE': 'Germany',
-            'FR': 'France',
-            'GB': 'United Kingdom',
-            'JP': 'Japan',
-            'IN': 'India',
-            'BR': 'Brazil',
-            'IT': 'Italy',
-            'CA': 'Canada',
-            'KR': 'South Korea',
-            'AU': 'Australia',
-            'ES': 'Spain',
-            'MX': 'Mexico',
-            'ID': 'Indonesia',
-            'TR': 'Turkey',
-            'SA': 'Saudi Arabia',
-            'CH': 'Switzerland',
-            'NL': 'Netherlands',
-            'SE': 'Sweden',
-            'NO': 'Norway',
-            'DK': 'Denmark',
-            'FI': 'Finland'
-        }
-        
-        return country_names.get(country_iso, country_iso)
+        return _ISO_TO_NAME.get(country_iso, country_iso)
     
     def _get_coalition_details(self, coalition_id):
         """Get details about a specific coalition."""
-        if not hasattr(self.game_state, 'diplomacy') or not hasattr(self.game_state.diplomacy, 'coalitions'):
+        coalition = self._find_coalition(coalition_id)
+        if coalition is None:
             return {'name': 'the coalition'}
             
-        for coalition in self.game_state.diplomacy.coalitions:
+        return {
+            'id': coalition.id,
+            'name': coalition.name,
+            'purpose': coalition.purpose,
+            'leader_country': coalition.leader_country,
+            'members': list(coalition.member_countries),
+            'cohesion': coalition.cohesion_level
+        }
+    
+    def _find_coalition(self, coalition_id):
+        """Find a coalition by id in the diplomacy system's coalition list."""
+        coalitions = getattr(self._diplomacy, 'coalitions', None)
+        if coalitions is None:
+            return None
+        for coalition in coalitions:
             if hasattr(coalition, 'id') and coalition.id == coalition_id:
-                return {
-                    'id': coalition.id,
-                    'name': coalition.name,
-                    'purpose': coalition.purpose,
-                    'leader_country': coalition.leader_country,
-                    'members': list(coalition.member_countries),
-                    'cohesion': coalition.cohesion_level
-                }
-                
-        return {'name': 'the coalition'}
+                return coalition
+        return None
     
     def get_recent_explanations(self, country_iso=None, limit=5):
         """Get recent decision explanations, optionally filtered by country."""
@@ -1310,67 +1658,68 @@ class AIExplanationSystem:
                 
             explanations = self.explanation_history[country_iso]
         else:
-            # Flatten all country explanations
-            explanations = []
-            for country, history in self.explanation_history.items():
-                explanations.extend([dict(item, country=country) for item in history])
+            # All country explanations; entries already carry their country
+            explanations = itertools.chain.from_iterable(self.explanation_history.values())
                 
-        # Sort by turn (most recent first)
-        explanations.sort(key=lambda x: x.get('turn', 0), reverse=True)
-        
-        # Return the most recent ones
-        return explanations[:limit]
+        # Select the most recent ones by turn without sorting the whole history
+        recent = heapq.nlargest(limit, explanations, key=lambda x: x.get('turn', 0))
+        
+        # Generate any deferred explanations among them
+        for item in recent:
+            if item['explanation'] is None:
+                self.get_explanation(item['decision_id'])
+        return recent
     
     def generate_explanation_report(self, country_iso):
         """Generate a comprehensive report of a country's decision patterns."""
+        self.refresh()
         if country_iso not in self.explanation_history or not self.explanation_history[country_iso]:
             return f"No decision history available for {self._get_country_name(country_iso)}"
             
         history = self.explanation_history[country_iso]
-        
-        # Count decision types
-        decision_counts = {}
-        for item in history:
-            decision_type = item.get('type', 'unknown')
-            decision_counts[decision_type] = decision_counts.get(decision_type, 0) + 1
+        decision_counts = self.decision_counts[country_iso]
+        diplomatic_targets = self.diplomatic_targets[country_iso]
             
         # Identify common patterns
         patterns = []
         
         # Most common decision type
-        most_common_type = max(decision_counts.items(), key=lambda x: x[1])
-        if most_common_type[1] > 1:
-            patterns.append(f"Frequently makes {most_common_type[0]} decisions ({most_common_type[1]} times)")
+        top_types = decision_counts.most_common(1)
+        if top_types and top_types[0][1] > 1:
+            decision_type, count = top_types[0]
+            patterns.append(f"Frequently makes {decision_type} decisions ({count} times)")
             
         # Check for common targets in diplomatic decisions
-        diplomatic_targets = {}
-        for item in history:
-            if item.get('type') == 'diplomatic':
-                target = item.get('details', {}).get('target_country')
-                if target:
-                    diplomatic_targets[target] = diplomatic_targets.get(target, 0) + 1
-                    
-        if diplomatic_targets:
-            most_common_target = max(diplomatic_targets.items(), key=lambda x: x[1])
-            if most_common_target[1] > 1:
-                patterns.append(f"Frequently engages diplomatically with {self._get_country_name(most_common_target[0])} ({most_common_target[1]} times)")
+        top_targets = diplomatic_targets.most_common(1)
+        if top_targets and top_targets[0][1] > 1:
+            target, count = top_targets[0]
+            patterns.append(f"Frequently engages diplomatically with {self._get_country_name(target)} ({count} times)")
         
-        # Generate the report
+        # Generate the report line by line
         country_name = self._get_country_name(country_iso)
-        report = f"Decision Pattern Analysis for {country_name}\n\n"
+        lines = [f"Decision Pattern Analysis for {country_name}", "", "Decision Type Summary:"]
         
-        report += "Decision Type Summary:\n"
         for decision_type, count in decision_counts.items():
-            report += f"- {decision_type.capitalize()}: {count} decisions\n"
+            label = _DECISION_LABELS.get(decision_type)
+            if label is None:
+                label = _DECISION_LABELS[decision_type] = decision_type.capitalize()
+            lines.append(f"- {label}: {count} decisions")
             
         if patterns:
-            report += "\nIdentified Patterns:\n"
-            for pattern in patterns:
-                report += f"- {pattern}\n"
+            lines.append("")
+            lines.append("Identified Patterns:")
+            lines.extend(f"- {pattern}" for pattern in patterns)
                 
-        report += f"\nTotal decisions analyzed: {len(history)}"
+        lines.append("")
+        lines.append(f"Total decisions analyzed: {len(history)}")
         
-        return report
+        return "\n".join(lines)
+
+class HistoryEvent(NamedTuple):
+    """A single entry in a coalition's event history."""
+    type: str
+    details: Dict
+    timestamp: int
 
 class Coalition:
     """
@@ -1378,6 +1727,11 @@ class Coalition:
     Coalitions can form for trade, defense, regional cooperation, or countering other coalitions.
     """
     
+    # Coalition ids are the process start time and pid plus a running count, so they
+    # stay unique across sessions and across processes started in the same second
+    _ID_PREFIX = f"{int(time.time())}_{os.getpid()}"
+    _next_id = itertools.count(1)
+    
     def __init__(self, name: str, purpose: str, founding_countries: List[str], 
                  formation_turn: int, leader_country: str = None, cohesion_level: float = 0.5):
         """
@@ -1391,16 +1745,20 @@ class Coalition:
             leader_country: ISO code of the country leading the coalition
             cohesion_level: Initial cohesion level (0.0-1.0)
         """
-        self.id = f"c_{int(time.time())}_{random.randint(1000, 9999)}"
+        self.id = f"c_{Coalition._ID_PREFIX}_{next(Coalition._next_id)}"
         self.name = name
         self.purpose = purpose
         self.member_countries = set(founding_countries)
+        # Members in joining order, used to pick a successor deterministically
+        self._join_order = dict.fromkeys(founding_countries)
         self.formation_turn = formation_turn
         self.end_turn = None
         self.leader_country = leader_country if leader_country else founding_countries[0]
-        self.cohesion_level = max(0.0, min(1.0, cohesion_level))
+        self.cohesion_level = 0.0 if cohesion_level < 0.0 else 1.0 if cohesion_level > 1.0 else cohesion_level
         self.target_coalition = None  # For counter-coalitions
         self.history = []
+        # Placeholder effectiveness score of the latest turn, as ((turn, purpose), score)
+        self._effectiveness_cache = (None, None)
         self.record_event("formation", {
             "founding_members": founding_countries,
             "leader": self.leader_country,
@@ -1422,6 +1780,7 @@ class Coalition:
             return False
             
         self.member_countries.add(country_iso)
+        self._join_order[country_iso] = None
         self.record_event("join", {
             "country": country_iso,
             "turn": turn
@@ -1442,12 +1801,15 @@ class Coalition:
         if country_iso not in self.member_countries:
             return False
             
-        # If the leader leaves, select a new leader
-        if country_iso == self.leader_country and len(self.member_countries) > 1:
-            self.member_countries.remove(country_iso)
-            self.leader_country = next(iter(self.member_countries))
-        else:
-            self.member_countries.remove(country_iso)
+        self.member_countries.remove(country_iso)
+        self._join_order.pop(country_iso, None)
+        
+        # If the leader leaves, the longest-standing remaining member takes over
+        if country_iso == self.leader_country and self.member_countries:
+            self.leader_country = next(
+                (member for member in self._join_order if member in self.member_countries),
+                None
+            ) or min(self.member_countries)  # members added directly to the set
             
         self.record_event("leave", {
             "country": country_iso,
@@ -1484,7 +1846,8 @@ class Coalition:
         Returns:
             New cohesion level
         """
-        self.cohesion_level = max(0.0, min(1.0, self.cohesion_level + change))
+        cohesion = self.cohesion_level + change
+        self.cohesion_level = 0.0 if cohesion < 0.0 else 1.0 if cohesion > 1.0 else cohesion
         return self.cohesion_level
         
     def is_active(self, current_turn: int = None) -> bool:
@@ -1497,11 +1860,8 @@ class Coalition:
         Returns:
             True if active, False if dissolved
         """
-        if self.end_turn is None:
-            return True
-        if current_turn is not None:
-            return current_turn <= self.end_turn
-        return False
+        end_turn = self.end_turn
+        return end_turn is None or (current_turn is not None and current_turn <= end_turn)
         
     def get_strength(self, game_state: Any) -> float:
         """
@@ -1514,22 +1874,19 @@ class Coalition:
             Strength score
         """
         strength = 0.0
+        countries = getattr(game_state, 'countries', None)
+        if countries is None:
+            return strength
         
         # Sum member country strengths
         for country_iso in self.member_countries:
-            if hasattr(game_state, 'countries') and country_iso in game_state.countries:
-                country = game_state.countries[country_iso]
-                
+            country = countries.get(country_iso)
+            if country is not None:
                 # Base on GDP
-                if hasattr(country, 'gdp'):
-                    strength += country.gdp / 1000  # Scale down
-                else:
-                    strength += 1.0  # Default value
-                    
-                # Adjust for cohesion
-                strength *= (0.5 + (self.cohesion_level * 0.5))  # 50-100% effectiveness based on cohesion
+                strength += getattr(country, 'gdp', 1000) / 1000  # Scale down, 1.0 by default
         
-        return strength
+        # Adjust for cohesion, once for the whole coalition
+        return strength * (0.5 + (self.cohesion_level * 0.5))  # 50-100% effectiveness based on cohesion
         
     def get_purpose_effectiveness(self, game_state: Any) -> float:
         """
@@ -1541,13 +1898,24 @@ class Coalition:
         Returns:
             Effectiveness score (0.0-1.0)
         """
-        if self.purpose == 'trade':
-            # For trade coalitions, measure trade growth between members
-            return self._evaluate_trade_effectiveness(game_state)
+        if self.purpose == 'trade' or self.purpose == 'defense':
+            # Trade and defense scores are evaluated once per turn
+            turn = getattr(game_state, 'current_turn', None)
+            cache_key = (turn, self.purpose)
+            cached_key, cached_score = self._effectiveness_cache
+            if turn is not None and cached_key == cache_key:
+                return cached_score
+            
+            if self.purpose == 'trade':
+                # For trade coalitions, measure trade growth between members
+                score = self._evaluate_trade_effectiveness(game_state)
+            else:
+                # For defense coalitions, evaluate security improvements
+                score = self._evaluate_defense_effectiveness(game_state)
             
-        elif self.purpose == 'defense':
-            # For defense coalitions, evaluate security improvements
-            return self._evaluate_defense_effectiveness(game_state)
+            if turn is not None:
+                self._effectiveness_cache = (cache_key, score)
+            return score
             
         elif self.purpose == 'counter' and self.target_coalition:
             # For counter-coalitions, measure relative strength vs target
@@ -1573,11 +1941,7 @@ class Coalition:
         
     def record_event(self, event_type: str, details: Dict) -> None:
         """Record an event in the coalition's history"""
-        self.history.append({
-            "type": event_type,
-            "details": details,
-            "timestamp": details.get("turn", 0)
-        })
+        self.history.append(HistoryEvent(event_type, details, details.get("turn", 0)))
         
     def __repr__(self) -> str:
         status = "Active" if self.is_active() else "Dissolved"
@@ -1,13 +1,13 @@
 from typing import Dict, Optional, List
 from backend.models import Country, load_countries_from_file, EconomicModel
+from backend.historical_data import HistoricalDataset
 import random  # For simple simulation
 import math
 import datetime
 import copy
-import json
+from types import MappingProxyType
 import numpy as np
-from scipy import stats, optimize
-import os
+from scipy import optimize
 import logging
 from backend.diplomacy_ai import CountryProfile, Coalition, CoalitionStrategy, DiplomacyAI, DiplomaticConsequence
 
@@ -15,7 +15,12 @@ from backend.diplomacy_ai import CountryProfile, Coalition, CoalitionStrategy, D
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Tariff categories whose import share comes from the country's industry breakdown
+_INDUSTRY_CATEGORIES = frozenset(('manufacturing', 'agriculture', 'services'))
+
 class DiplomacyRelation:
+    __slots__ = ('country_a', 'country_b', 'relation_level', 'last_event')
+
     def __init__(self, country_a, country_b, relation_level=0.0, last_event=None):
         self.country_a = country_a
         self.country_b = country_b
@@ -23,6 +28,8 @@ class DiplomacyRelation:
         self.last_event = last_event
 
 class Alliance:
+    __slots__ = ('name', 'members', 'date_formed', 'is_active', 'type', 'date_disbanded')
+
     def __init__(self, name, members, date_formed, is_active=True, type_="general"):
         self.name = name
         self.members = members  # Liste af ISO-koder
@@ -42,163 +49,6 @@ def find_relation(relations, country_a, country_b):
             return rel
     return None
 
-class HistoricalDataset:
-    """
-    Represents historical economic data for calibration and benchmarking.
-    """
-    def __init__(self, data_path=None):
-        self.data = {}
-        self.global_averages = {}
-        self.regional_averages = {}
-        self.loaded = False
-        if data_path:
-            self.load_data(data_path)
-    
-    def load_data(self, data_path):
-        """Load historical data from a JSON file."""
-        try:
-            if os.path.exists(data_path):
-                with open(data_path, encoding='utf-8') as f:
-                    self.data = json.load(f)
-                self._calculate_averages()
-                self.loaded = True
-                logger.info(f"Historical data loaded successfully from {data_path}")
-            else:
-                logger.warning(f"Historical data file not found at {data_path}")
-        except Exception as e:
-            logger.error(f"Error loading historical data: {e}")
-    
-    def _calculate_averages(self):
-        """Calculate global and regional averages for benchmarking."""
-        metric_sums = {}
-        metric_counts = {}
-        regional_data = {}
-        
-        for country_iso, country_data in self.data.items():
-            region = country_data.get('region', 'Unknown')
-            if region not in regional_data:
-                regional_data[region] = {}
-            
-            for year, yearly_data in country_data.get('yearly_data', {}).items():
-                for metric, value in yearly_data.items():
-                    if isinstance(value, (int, float)):
-                        if metric not in metric_sums:
-                            metric_sums[metric] = {}
-                            metric_counts[metric] = {}
-                        
-                        if year not in metric_sums[metric]:
-                            metric_sums[metric][year] = 0
-                            metric_counts[metric][year] = 0
-                        
-                        metric_sums[metric][year] += value
-                        metric_counts[metric][year] += 1
-                
-                if year not in regional_data[region]:
-                    regional_data[region][year] = {}
-                
-                for metric, value in yearly_data.items():
-                    if isinstance(value, (int, float)):
-                        if metric not in regional_data[region][year]:
-                            regional_data[region][year][metric] = []
-                        
-                        regional_data[region][year][metric].append(value)
-        
-        for metric, year_data in metric_sums.items():
-            self.global_averages[metric] = {}
-            for year, total in year_data.items():
-                count = metric_counts[metric][year]
-                if count > 0:
-                    self.global_averages[metric][year] = total / count
-        
-        for region, years in regional_data.items():
-            if region not in self.regional_averages:
-                self.regional_averages[region] = {}
-            
-            for year, metrics in years.items():
-                self.regional_averages[region][year] = {}
-                for metric, values in metrics.items():
-                    if values:
-                        self.regional_averages[region][year][metric] = sum(values) / len(values)
-    
-    def get_historical_data(self, country_iso, start_year=None, end_year=None):
-        """Get historical data for a specific country."""
-        if country_iso not in self.data:
-            logger.warning(f"No historical data found for country: {country_iso}")
-            return None
-        
-        country_data = self.data[country_iso].get('yearly_data', {})
-        
-        if start_year or end_year:
-            filtered_data = {}
-            for year_str, data in country_data.items():
-                year = int(year_str)
-                if (start_year is None or year >= start_year) and (end_year is None or year <= end_year):
-                    filtered_data[year_str] = data
-            return filtered_data
-        
-        return country_data
-    
-    def get_benchmark_data(self, country_iso, metric, years):
-        """
-        Get benchmark data for a specific country and metric.
-        Returns a dict with country, regional, and global values.
-        """
-        result = {
-            'country_values': [],
-            'regional_values': [],
-            'global_values': []
-        }
-        
-        if not self.loaded or country_iso not in self.data:
-            logger.warning(f"No data for benchmarking country: {country_iso}")
-            return result
-        
-        region = self.data[country_iso].get('region', 'Unknown')
-        
-        for year in years:
-            year_str = str(year)
-            if year_str in self.data[country_iso].get('yearly_data', {}) and metric in self.data[country_iso]['yearly_data'][year_str]:
-                result['country_values'].append(self.data[country_iso]['yearly_data'][year_str][metric])
-            else:
-                result['country_values'].append(None)
-            
-            if region in self.regional_averages and year_str in self.regional_averages[region] and metric in self.regional_averages[region][year_str]:
-                result['regional_values'].append(self.regional_averages[region][year_str][metric])
-            else:
-                result['regional_values'].append(None)
-            
-            if metric in self.global_averages and year_str in self.global_averages[metric]:
-                result['global_values'].append(self.global_averages[metric][year_str])
-            else:
-                result['global_values'].append(None)
-        
-        return result
-    
-    def get_country_benchmarks(self, country_iso, years=None, metrics=None):
-        """
-        Get benchmarks data structured for API: years list and metrics dict mapping each metric
-        to country, regional, and global series.
-        """
-        import datetime
-        if not self.loaded or country_iso not in self.data:
-            return {'years': years or [], 'metrics': {}}
-        # Default to last 10 years if not provided
-        current_year = datetime.datetime.now().year
-        if years is None:
-            years = [str(current_year - i) for i in reversed(range(10))]
-        # Default metrics to available ones
-        available = set(self.global_averages.keys())
-        if metrics is None:
-            metrics = list(available)
-        # Build metrics structure
-        result_metrics = {}
-        for metric in metrics:
-            # get_benchmark_data expects years as ints
-            year_ints = [int(y) for y in years]
-            bench = self.get_benchmark_data(country_iso, metric, year_ints)
-            result_metrics[metric] = bench
-        return {'years': years, 'metrics': result_metrics}
-
 class EconomicCalibrator:
     """
     Calibrates economic model parameters based on historical data.
@@ -219,12 +69,11 @@ class EconomicCalibrator:
             logger.warning(f"Cannot calibrate for {country_iso}: No historical data found")
             return model_parameters
         
-        historical_series = {}
-        for metric in target_metrics:
-            historical_series[metric] = []
-            for year in sorted(historical_data.keys()):
-                if metric in historical_data[year]:
-                    historical_series[metric].append(historical_data[year][metric])
+        years = sorted(historical_data)
+        historical_series = {
+            metric: [historical_data[year][metric] for year in years if metric in historical_data[year]]
+            for metric in target_metrics
+        }
         
         for metric, series in historical_series.items():
             if len(series) < 5:
@@ -375,62 +224,78 @@ class EconomicCalibrator:
         
         return " ".join(explanations)
 
+# Narrative templates for EnhancedFeedbackSystem, shared by every instance and read-only
+_NARRATIVE_TEMPLATES = MappingProxyType({
+    "gdp_growth": MappingProxyType({
+        "positive": (
+            "The economy is experiencing robust growth, with GDP expanding at {value}% annually.",
+            "Economic activity has strengthened, with GDP growing at {value}% compared to the previous period."
+        ),
+        "negative": (
+            "The economy is contracting, with GDP shrinking at a rate of {value}% annually.",
+            "Economic activity has weakened significantly, with GDP declining by {value}% compared to the previous period."
+        ),
+        "neutral": (
+            "The economy is growing steadily at {value}% annually.",
+            "Economic activity is maintaining a moderate pace, with GDP expanding by {value}% compared to the previous period."
+        )
+    }),
+    "inflation": MappingProxyType({
+        "high": (
+            "Inflation has accelerated to {value}%, significantly above the target range.",
+            "Price pressures are mounting, with inflation reaching {value}% annually."
+        ),
+        "low": (
+            "Inflation remains subdued at {value}%, below the target range.",
+            "Price pressures are minimal, with inflation at just {value}% annually."
+        ),
+        "target": (
+            "Inflation is well-contained at {value}%, within the target range.",
+            "Price stability is maintained with inflation at {value}% annually."
+        )
+    }),
+    "trade_balance": MappingProxyType({
+        "surplus": (
+            "The country is maintaining a strong trade surplus of {value}% of GDP.",
+            "Export competitiveness remains high, leading to a trade surplus of {value}% of GDP."
+        ),
+        "deficit": (
+            "The country is running a trade deficit of {value}% of GDP.",
+            "Import dependence is reflected in a trade deficit of {value}% of GDP."
+        ),
+        "balanced": (
+            "Trade flows are roughly balanced, with a small {surplus_or_deficit} of {value}% of GDP.",
+            "The external position is stable with a {surplus_or_deficit} of {value}% of GDP."
+        )
+    })
+})
+
 class EnhancedFeedbackSystem:
     """
     Provides detailed economic explanations and feedback for game events and decisions.
     Incorporates historical benchmarking and realistic economic analysis.
     """
-    def __init__(self, historical_data=None):
+    # Narrative method for each metric handled by _generate_narrative
+    _NARRATIVE_GENERATORS = {
+        'gdp_growth': '_generate_gdp_growth_narrative',
+        'inflation': '_generate_inflation_narrative',
+        'unemployment': '_generate_unemployment_narrative',
+        'trade_balance': '_generate_trade_balance_narrative'
+    }
+    
+    def __init__(self, historical_data=None, seed=None):
         self.historical_data = historical_data
         self.global_context = {}
+        # Own generator so narrative choices can be reproduced with a seed
+        self._rng = random.Random(seed)
         self.narrative_templates = self._load_narrative_templates()
+        # Five-year benchmark window for insights, fixed when the session starts
+        current_year = datetime.datetime.now().year
+        self._recent_years = tuple(current_year - i for i in range(1, 6))
     
     def _load_narrative_templates(self):
         """Load narrative templates for various economic situations."""
-        return {
-            "gdp_growth": {
-                "positive": [
-                    "The economy is experiencing robust growth, with GDP expanding at {value}% annually.",
-                    "Economic activity has strengthened, with GDP growing at {value}% compared to the previous period."
-                ],
-                "negative": [
-                    "The economy is contracting, with GDP shrinking at a rate of {value}% annually.",
-                    "Economic activity has weakened significantly, with GDP declining by {value}% compared to the previous period."
-                ],
-                "neutral": [
-                    "The economy is growing steadily at {value}% annually.",
-                    "Economic activity is maintaining a moderate pace, with GDP expanding by {value}% compared to the previous period."
-                ]
-            },
-            "inflation": {
-                "high": [
-                    "Inflation has accelerated to {value}%, significantly above the target range.",
-                    "Price pressures are mounting, with inflation reaching {value}% annually."
-                ],
-                "low": [
-                    "Inflation remains subdued at {value}%, below the target range.",
-                    "Price pressures are minimal, with inflation at just {value}% annually."
-                ],
-                "target": [
-                    "Inflation is well-contained at {value}%, within the target range.",
-                    "Price stability is maintained with inflation at {value}% annually."
-                ]
-            },
-            "trade_balance": {
-                "surplus": [
-                    "The country is maintaining a strong trade surplus of {value}% of GDP.",
-                    "Export competitiveness remains high, leading to a trade surplus of {value}% of GDP."
-                ],
-                "deficit": [
-                    "The country is running a trade deficit of {value}% of GDP.",
-                    "Import dependence is reflected in a trade deficit of {value}% of GDP."
-                ],
-                "balanced": [
-                    "Trade flows are roughly balanced, with a small {surplus_or_deficit} of {value}% of GDP.",
-                    "The external position is stable with a {surplus_or_deficit} of {value}% of GDP."
-                ]
-            }
-        }
+        return _NARRATIVE_TEMPLATES
     
     def generate_economic_insight(self, country_data, metric, historical_comparison=True):
         """
@@ -444,11 +309,10 @@ class EnhancedFeedbackSystem:
         
         if historical_comparison and self.historical_data and 'iso_code' in country_data:
             try:
-                recent_years = [datetime.datetime.now().year - i for i in range(1, 6)]
                 benchmark = self.historical_data.get_benchmark_data(
                     country_data['iso_code'], 
                     metric, 
-                    recent_years
+                    self._recent_years
                 )
                 
                 country_values = [v for v in benchmark['country_values'] if v is not None]
@@ -476,11 +340,16 @@ class EnhancedFeedbackSystem:
     
     def _calculate_trend(self, values):
         """Calculate the trend direction from a series of values."""
-        if len(values) < 2:
+        n = len(values)
+        if n < 2:
             return "stable"
         
-        x = list(range(len(values)))
-        slope, _, _, _, _ = stats.linregress(x, values)
+        # Least-squares slope against x = 0..n-1; only the slope is needed,
+        # so skip linregress and its r/p-value/stderr passes
+        mean_x = (n - 1) / 2
+        sxy = sum((i - mean_x) * value for i, value in enumerate(values))
+        sxx = n * (n * n - 1) / 12
+        slope = sxy / sxx
         
         if abs(slope) < 0.1:
             return "stable"
@@ -491,16 +360,10 @@ class EnhancedFeedbackSystem:
     
     def _generate_narrative(self, metric, value, historical_context):
         """Generate a narrative description based on the metric and context."""
-        if metric == 'gdp_growth':
-            return self._generate_gdp_growth_narrative(value, historical_context)
-        elif metric == 'inflation':
-            return self._generate_inflation_narrative(value, historical_context)
-        elif metric == 'unemployment':
-            return self._generate_unemployment_narrative(value, historical_context)
-        elif metric == 'trade_balance':
-            return self._generate_trade_balance_narrative(value, historical_context)
-        else:
-            return f"The {metric.replace('_', ' ')} is currently at {value}."
+        method_name = self._NARRATIVE_GENERATORS.get(metric)
+        if method_name:
+            return getattr(self, method_name)(value, historical_context)
+        return f"The {metric.replace('_', ' ')} is currently at {value}."
     
     def _generate_gdp_growth_narrative(self, value, historical_context):
         """Generate narrative for GDP growth."""
@@ -513,7 +376,7 @@ class EnhancedFeedbackSystem:
             template_key = "neutral"
         
         templates = self.narrative_templates["gdp_growth"][template_key]
-        base_narrative = random.choice(templates).format(value=value)
+        base_narrative = self._rng.choice(templates).format(value=value)
         
         if historical_context:
             historical_avg = historical_context.get('historical_avg')
@@ -554,7 +417,7 @@ class EnhancedFeedbackSystem:
             template_key = "target"
         
         templates = self.narrative_templates["inflation"][template_key]
-        base_narrative = random.choice(templates).format(value=value)
+        base_narrative = self._rng.choice(templates).format(value=value)
         
         if historical_context:
             historical_avg = historical_context.get('historical_avg')
@@ -601,33 +464,33 @@ class EnhancedFeedbackSystem:
         
         # Get the narrative based on the current value
         if value > 0:
-            base_narrative = f"The trade balance is positive at {value:.1f}% of GDP, indicating a trade surplus."
+            parts = [f"The trade balance is positive at {value:.1f}% of GDP, indicating a trade surplus."]
             if value > hist_avg * 1.5:
-                base_narrative += " This is a significantly strong trade position."
+                parts.append(" This is a significantly strong trade position.")
             elif value > hist_avg:
-                base_narrative += " This is above the historical average, showing a healthy external position."
+                parts.append(" This is above the historical average, showing a healthy external position.")
         elif value < 0:
-            base_narrative = f"The trade balance is negative at {value:.1f}% of GDP, indicating a trade deficit."
+            parts = [f"The trade balance is negative at {value:.1f}% of GDP, indicating a trade deficit."]
             if value < hist_min * 0.8:
-                base_narrative += " This deficit is substantially larger than historical norms and may require attention."
+                parts.append(" This deficit is substantially larger than historical norms and may require attention.")
             elif value < hist_avg:
-                base_narrative += " This is below the historical average, suggesting potential competitiveness issues."
+                parts.append(" This is below the historical average, suggesting potential competitiveness issues.")
         else:
-            base_narrative = "The trade balance is balanced (0% of GDP), indicating equal exports and imports."
+            parts = ["The trade balance is balanced (0% of GDP), indicating equal exports and imports."]
         
         # Add trend context
         if trend == 'improving':
-            base_narrative += " The trend is improving, showing strengthening trade competitiveness."
+            parts.append(" The trend is improving, showing strengthening trade competitiveness.")
         elif trend == 'deteriorating':
-            base_narrative += " The trend is deteriorating, suggesting declining export competitiveness or increasing import dependency."
+            parts.append(" The trend is deteriorating, suggesting declining export competitiveness or increasing import dependency.")
         
         # Add policy implications
         if value < -3:
-            base_narrative += " Policy options might include export promotion, currency depreciation, or import substitution strategies."
+            parts.append(" Policy options might include export promotion, currency depreciation, or import substitution strategies.")
         elif value > 5:
-            base_narrative += " While a surplus is positive, an excessively high surplus might indicate underinvestment in the domestic economy."
+            parts.append(" While a surplus is positive, an excessively high surplus might indicate underinvestment in the domestic economy.")
         
-        return base_narrative
+        return "".join(parts)
         
     def generate_comparison_report(self, country_iso, metrics):
         """
@@ -662,34 +525,32 @@ class EnhancedFeedbackSystem:
             regional_avg = sum(regional_values) / len(regional_values) if regional_values else 0
             global_avg = sum(global_values) / len(global_values) if global_values else 0
             
-            narrative = f"Historical {metric} analysis:\n"
+            lines = [f"Historical {metric} analysis:\n"]
             
             # Country historical performance
-            narrative += f"- Historical average for this country: {country_avg:.2f}%\n"
+            lines.append(f"- Historical average for this country: {country_avg:.2f}%\n")
             if len(country_values) >= 2:
                 if country_values[-1] > country_values[0]:
-                    narrative += f"- Long-term trend: Increasing (from {country_values[0]:.2f}% to {country_values[-1]:.2f}%)\n"
+                    lines.append(f"- Long-term trend: Increasing (from {country_values[0]:.2f}% to {country_values[-1]:.2f}%)\n")
                 elif country_values[-1] < country_values[0]:
-                    narrative += f"- Long-term trend: Decreasing (from {country_values[0]:.2f}% to {country_values[-1]:.2f}%)\n"
+                    lines.append(f"- Long-term trend: Decreasing (from {country_values[0]:.2f}% to {country_values[-1]:.2f}%)\n")
                 else:
-                    narrative += "- Long-term trend: Stable\n"
+                    lines.append("- Long-term trend: Stable\n")
             
             # Regional and global comparison
             if regional_values:
-                narrative += f"- Regional average: {regional_avg:.2f}%"
                 if country_avg > regional_avg:
-                    narrative += f" (Country performs {country_avg - regional_avg:.2f}% better than region)\n"
+                    lines.append(f"- Regional average: {regional_avg:.2f}% (Country performs {country_avg - regional_avg:.2f}% better than region)\n")
                 else:
-                    narrative += f" (Country performs {regional_avg - country_avg:.2f}% worse than region)\n"
+                    lines.append(f"- Regional average: {regional_avg:.2f}% (Country performs {regional_avg - country_avg:.2f}% worse than region)\n")
             
             if global_values:
-                narrative += f"- Global average: {global_avg:.2f}%"
                 if country_avg > global_avg:
-                    narrative += f" (Country performs {country_avg - global_avg:.2f}% better than global average)\n"
+                    lines.append(f"- Global average: {global_avg:.2f}% (Country performs {country_avg - global_avg:.2f}% better than global average)\n")
                 else:
-                    narrative += f" (Country performs {global_avg - country_avg:.2f}% worse than global average)\n"
+                    lines.append(f"- Global average: {global_avg:.2f}% (Country performs {global_avg - country_avg:.2f}% worse than global average)\n")
             
-            report[metric] = narrative
+            report[metric] = "".join(lines)
         
         return report
 
@@ -789,23 +650,27 @@ class BudgetManager:
         
         # Calculate tariff revenue
         tariff_revenue = 0.0
+        tariffs = country.tariffs
+        # Import share per tariff category, read from the industry breakdown when first needed
+        category_shares = {}
         for partner_iso, trade_data in country.trade_partners.items():
+            if partner_iso not in tariffs:
+                continue
+            
+            # Apply tariff rates to imports from this country
             imports = trade_data.get('imports', 0.0)
-            if partner_iso in country.tariffs:
-                # Apply tariff rates to imports from this country
-                for category, rate in country.tariffs[partner_iso].items():
+            for category, rate in tariffs[partner_iso].items():
+                share = category_shares.get(category)
+                if share is None:
                     # Estimate the proportion of this category in total imports
                     # For simplicity, we'll use the industry breakdown
-                    if category == 'manufacturing':
-                        proportion = country.industries.manufacturing
-                    elif category == 'agriculture':
-                        proportion = country.industries.agriculture
-                    elif category == 'services':
-                        proportion = country.industries.services
+                    if category in _INDUSTRY_CATEGORIES:
+                        share = getattr(country.industries, category)
                     else:
-                        proportion = 0.1  # Default for other categories
-                    
-                    tariff_revenue += imports * proportion * rate
+                        share = 0.1  # Default for other categories
+                    category_shares[category] = share
+                
+                tariff_revenue += imports * share * rate
         
         country.budget['revenue']['tariffs'] = tariff_revenue
         
@@ -933,8 +798,7 @@ class BudgetManager:
         country.subsidies[sector_name]['effects'] = effects
         
         # Recalculate country-level metrics
-        country.gdp = self.economic_model.aggregate_gdp(country)
-        country.unemployment_rate = self.economic_model.aggregate_unemployment(country)
+        country.gdp, country.unemployment_rate = self.economic_model.aggregate_country(country)
         
         # Recalculate budget with the new expenses
         self.calculate_budget(country)
@@ -996,8 +860,7 @@ class BudgetManager:
         removed_subsidy = country.subsidies.pop(sector_name)
         
         # Recalculate country-level metrics
-        country.gdp = self.economic_model.aggregate_gdp(country)
-        country.unemployment_rate = self.economic_model.aggregate_unemployment(country)
+        country.gdp, country.unemployment_rate = self.economic_model.aggregate_country(country)
         
         # Recalculate budget with the updated expenses
         self.calculate_budget(country)
@@ -0,0 +1,187 @@
+"""
+Historical Data Module for Trade War Simulator
+
+This module loads historical economic data per country and derives the global and
+regional averages used for calibration and benchmarking.
+"""
+
+import bisect
+import json
+import logging
+import os
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Value types counted as numeric data points in historical datasets
+_NUMERIC_TYPES = (int, float)
+
+class HistoricalDataset:
+    """
+    Represents historical economic data for calibration and benchmarking.
+    """
+    # Number of benchmark queries whose series are kept between calls
+    BENCHMARK_CACHE_LIMIT = 256
+    
+    def __init__(self, data_path=None):
+        self.data = {}
+        self.global_averages = {}
+        self.regional_averages = {}
+        self.loaded = False
+        # (country_iso, metric, years) -> (country, regional, global) value tuples, oldest first
+        self._benchmark_cache = {}
+        # country_iso -> (sorted int years, matching year keys), built on first ranged query
+        self._year_index = {}
+        if data_path:
+            self.load_data(data_path)
+    
+    def load_data(self, data_path):
+        """Load historical data from a JSON file."""
+        try:
+            if os.path.exists(data_path):
+                with open(data_path, encoding='utf-8') as f:
+                    self.data = json.load(f)
+                self._benchmark_cache.clear()
+                self._year_index.clear()
+                self._calculate_averages()
+                self.loaded = True
+                logger.info(f"Historical data loaded successfully from {data_path}")
+            else:
+                logger.warning(f"Historical data file not found at {data_path}")
+        except Exception as e:
+            logger.error(f"Error loading historical data: {e}")
+    
+    def _calculate_averages(self):
+        """Calculate global and regional averages for benchmarking."""
+        metric_sums = defaultdict(lambda: defaultdict(int))
+        metric_counts = defaultdict(lambda: defaultdict(int))
+        # region -> year -> metric -> running [sum, count]
+        regional_data = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: [0, 0])))
+        
+        for country_iso, country_data in self.data.items():
+            regional_years = regional_data[country_data.get('region', 'Unknown')]
+            
+            for year, yearly_data in country_data.get('yearly_data', {}).items():
+                regional_year = regional_years[year]
+                
+                # One pass feeds both the global and the regional accumulators
+                for metric, value in yearly_data.items():
+                    if not isinstance(value, _NUMERIC_TYPES):
+                        continue
+                    
+                    metric_sums[metric][year] += value
+                    metric_counts[metric][year] += 1
+                    
+                    totals = regional_year[metric]
+                    totals[0] += value
+                    totals[1] += 1
+        
+        for metric, year_data in metric_sums.items():
+            self.global_averages[metric] = {}
+            for year, total in year_data.items():
+                count = metric_counts[metric][year]
+                if count > 0:
+                    self.global_averages[metric][year] = total / count
+        
+        for region, years in regional_data.items():
+            if region not in self.regional_averages:
+                self.regional_averages[region] = {}
+            
+            for year, metrics in years.items():
+                self.regional_averages[region][year] = {}
+                for metric, (total, count) in metrics.items():
+                    if count:
+                        self.regional_averages[region][year][metric] = total / count
+    
+    def get_historical_data(self, country_iso, start_year=None, end_year=None):
+        """Get historical data for a specific country."""
+        if country_iso not in self.data:
+            logger.warning(f"No historical data found for country: {country_iso}")
+            return None
+        
+        country_data = self.data[country_iso].get('yearly_data', {})
+        
+        if start_year or end_year:
+            years, year_keys = self._get_year_index(country_iso)
+            lo = 0 if start_year is None else bisect.bisect_left(years, start_year)
+            hi = len(years) if end_year is None else bisect.bisect_right(years, end_year)
+            return {year_str: country_data[year_str] for year_str in year_keys[lo:hi]}
+        
+        return country_data
+    
+    def _get_year_index(self, country_iso):
+        """Sorted years for a country so year ranges can be selected by bisection."""
+        index = self._year_index.get(country_iso)
+        if index is None:
+            pairs = sorted((int(year_str), year_str) for year_str in self.data[country_iso].get('yearly_data', {}))
+            index = self._year_index[country_iso] = ([year for year, _ in pairs], [year_str for _, year_str in pairs])
+        return index
+    
+    def get_benchmark_data(self, country_iso, metric, years):
+        """
+        Get benchmark data for a specific country and metric.
+        Returns a dict with country, regional, and global values.
+        """
+        if not self.loaded or country_iso not in self.data:
+            logger.warning(f"No data for benchmarking country: {country_iso}")
+            return {
+                'country_values': [],
+                'regional_values': [],
+                'global_values': []
+            }
+        
+        key = (country_iso, metric, tuple(years))
+        series = self._benchmark_cache.get(key)
+        if series is None:
+            if len(self._benchmark_cache) >= self.BENCHMARK_CACHE_LIMIT:
+                # Evict the oldest query so the cache stays bounded
+                del self._benchmark_cache[next(iter(self._benchmark_cache))]
+            series = self._benchmark_cache[key] = self._collect_benchmark_series(country_iso, metric, years)
+        
+        # Hand out fresh lists so callers cannot mutate the cached series
+        country_values, regional_values, global_values = series
+        return {
+            'country_values': list(country_values),
+            'regional_values': list(regional_values),
+            'global_values': list(global_values)
+        }
+    
+    def _collect_benchmark_series(self, country_iso, metric, years):
+        """Walk the dataset for one benchmark query; the result is cached by get_benchmark_data."""
+        # Resolve the per-country, per-region and per-metric tables once
+        country_data = self.data[country_iso]
+        yearly_data = country_data.get('yearly_data', {})
+        regional_years = self.regional_averages.get(country_data.get('region', 'Unknown'), {})
+        global_years = self.global_averages.get(metric, {})
+        
+        year_strs = [str(year) for year in years]
+        return (
+            tuple([yearly_data.get(year_str, {}).get(metric) for year_str in year_strs]),
+            tuple([regional_years.get(year_str, {}).get(metric) for year_str in year_strs]),
+            tuple([global_years.get(year_str) for year_str in year_strs])
+        )
+    
+    def get_country_benchmarks(self, country_iso, years=None, metrics=None):
+        """
+        Get benchmarks data structured for API: years list and metrics dict mapping each metric
+        to country, regional, and global series.
+        """
+        import datetime
+        if not self.loaded or country_iso not in self.data:
+            return {'years': years or [], 'metrics': {}}
+        # Default to last 10 years if not provided
+        current_year = datetime.datetime.now().year
+        if years is None:
+            years = [str(current_year - i) for i in reversed(range(10))]
+        # Default metrics to available ones
+        available = set(self.global_averages.keys())
+        if metrics is None:
+            metrics = list(available)
+        # Build metrics structure
+        result_metrics = {}
+        for metric in metrics:
+            # get_benchmark_data expects years as ints
+            year_ints = [int(y) for y in years]
+            bench = self.get_benchmark_data(country_iso, metric, year_ints)
+            result_metrics[metric] = bench
+        return {'years': years, 'metrics': result_metrics}
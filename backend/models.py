@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 class Industry:
     def __init__(self, manufacturing: float, services: float, agriculture: float):
@@ -39,6 +39,9 @@ class Sector:
         import_: Importvolumen
         unemployment_rate: Ledighed i sektoren
     """
+    __slots__ = ('name', 'output', 'employment', 'import_share', 'price', 'capital_stock',
+                 'potential_output', 'import_price', 'export', 'import_', 'unemployment_rate')
+
     def __init__(self, name: str, output: float, employment: float, import_share: float,
                  price: float = 1.0, capital_stock: float = 0.0, potential_output: float = 0.0,
                  import_price: float = 1.0, export: float = 0.0, import_: float = 0.0,
@@ -130,6 +133,106 @@ class Country:
         # Subsidies structure: {'sector_name': {'amount': float, 'percentage': float, 'effects': {...}}}
         self.subsidies = subsidies if subsidies is not None else {}
 
+    @classmethod
+    def from_dict(cls, data: Dict):
+        return cls(
+            name=data.get('name', ''),
+            output=data.get('output', 0.0),
+            employment=data.get('employment', 0.0),
+            import_share=data.get('import_share', 0.0),
+            price=data.get('price', 1.0),
+            capital_stock=data.get('capital_stock', 0.0),
+            potential_output=data.get('potential_output', 0.0),
+            import_price=data.get('import_price', 1.0),
+            export=data.get('export', 0.0),
+            import_=data.get('import_', 0.0),
+            unemployment_rate=data.get('unemployment_rate', 0.0)
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'output': self.output,
+            'employment': self.employment,
+            'import_share': self.import_share,
+            'price': self.price,
+            'capital_stock': self.capital_stock,
+            'potential_output': self.potential_output,
+            'import_price': self.import_price,
+            'export': self.export,
+            'import_': self.import_,
+            'unemployment_rate': self.unemployment_rate
+        }
+
+class Country:
+    def __init__(self, name: str, iso_code: str, gdp: float, population: float,
+                 industries: Industry, trade_partners: Dict, tariffs: Dict,
+                 unemployment_rate: float, growth_rate: float, approval_rating: float,
+                 government_type: str, is_eu_member: Optional[bool] = False,
+                 sectors: Optional[List[Sector]] = None, 
+                 budget: Optional[Dict] = None,
+                 subsidies: Optional[Dict] = None):
+        self.name = name
+        self.iso_code = iso_code
+        self.gdp = gdp
+        self.population = population
+        self.industries = industries
+        self.trade_partners = trade_partners # { "iso_code": { "exports": value, "imports": value } }
+        self.tariffs = tariffs # { "iso_code": { "goods_category": rate } }
+        self.unemployment_rate = unemployment_rate
+        self.growth_rate = growth_rate
+        self.approval_rating = approval_rating
+        self.government_type = government_type
+        self.is_eu_member = is_eu_member
+        self.sectors = sectors if sectors is not None else []
+        # Budget structure: {'revenue': {...}, 'expenses': {...}, 'balance': float}
+        self.budget = budget if budget is not None else {
+            'revenue': {
+                'taxation': 0.0,
+                'tariffs': 0.0,
+                'other': 0.0
+            },
+            'expenses': {
+                'subsidies': 0.0,
+                'social_services': 0.0,
+                'defense': 0.0,
+                'infrastructure': 0.0,
+                'education': 0.0,
+                'healthcare': 0.0
+            },
+            'balance': 0.0,
+            'debt': 0.0,
+            'debt_to_gdp_ratio': 0.0
+        }
+        
+        # Subsidies structure: {'sector_name': {'amount': float, 'percentage': float, 'effects': {...}}}
+        self.subsidies = subsidies if subsidies is not None else {}
+        # Sektornavn (små bogstaver) -> position i self.sectors; se get_sector
+        self._sector_index = None
+        self._indexed_sectors = None
+
+    def get_sector(self, sector_name: str) -> Optional[Sector]:
+        """
+        Finder en sektor ud fra navnet uden hensyn til store og små bogstaver.
+        Indekset kontrolleres ved hvert opslag og genopbygges, hvis sektorlisten
+        er udskiftet eller ændret, så udskiftede Sector-objekter altid findes.
+        """
+        key = sector_name.lower()
+        sectors = self.sectors
+        if self._indexed_sectors is sectors:
+            position = self._sector_index.get(key)
+            if position is not None and position < len(sectors) and sectors[position].name.lower() == key:
+                return sectors[position]
+        # Forældet indeks eller ukendt navn: genopbyg og slå op igen
+        index = {}
+        for position, sector in enumerate(sectors):
+            # Første sektor med et givent navn vinder, som ved lineær søgning
+            index.setdefault(sector.name.lower(), position)
+        self._sector_index = index
+        self._indexed_sectors = sectors
+        position = index.get(key)
+        return sectors[position] if position is not None else None
+
     @classmethod
     def from_dict(cls, data: Dict):
         industries_data = data.get('industries', {})
@@ -220,12 +323,28 @@ class EconomicModel:
     def aggregate_unemployment(self, country: 'Country') -> float:
         """Vægtet gennemsnit af sektorers ledighed."""
         if hasattr(country, 'sectors'):
-            total_labor = sum(sector.employment for sector in country.sectors)
+            total_labor = weighted_unemployment = 0
+            for sector in country.sectors:
+                total_labor += sector.employment
+                weighted_unemployment += sector.unemployment_rate * sector.employment
             if total_labor == 0:
                 return 0.0
-            return sum(sector.unemployment_rate * sector.employment for sector in country.sectors) / total_labor
+            return weighted_unemployment / total_labor
         return country.unemployment_rate
 
+    def aggregate_country(self, country: 'Country') -> Tuple[float, float]:
+        """Beregner BNP og vægtet ledighed i ét gennemløb af sektorerne."""
+        if not hasattr(country, 'sectors'):
+            return country.gdp, country.unemployment_rate
+        total_output = total_labor = weighted_unemployment = 0
+        for sector in country.sectors:
+            total_output += sector.output
+            total_labor += sector.employment
+            weighted_unemployment += sector.unemployment_rate * sector.employment
+        if total_labor == 0:
+            return total_output, 0.0
+        return total_output, weighted_unemployment / total_labor
+
 def load_countries_from_file(filepath: str) -> Dict[str, Country]:
     """Loads country data from a JSON file."""
     try:
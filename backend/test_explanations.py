@@ -0,0 +1,184 @@
+import os
+import unittest
+from types import SimpleNamespace
+from backend.diplomacy_ai import AIExplanationSystem, Coalition, ExplanationTemplate
+
+class TestExplanationTemplate(unittest.TestCase):
+    """Test suite for precompiled explanation templates"""
+
+    def test_matches_str_format(self):
+        """Rendering should match str.format, including brace escapes and conversions"""
+        cases = [
+            'a{{b{x}c',
+            '{x}}}y',
+            '{{}}{x}',
+            '{x!r} z',
+            '{x!s:>4}|{x!a}',
+            '{x:>6} and {y:.2f}',
+            '{x}{x}{y}',
+            'no fields at all',
+            '',
+            '{x.upper}',
+            '{x:{y}}',
+        ]
+        for text in cases:
+            with self.subTest(text=text):
+                self.assertEqual(ExplanationTemplate(text)(x='V', y=3), text.format(x='V', y=3))
+
+    def test_needed_fields(self):
+        """Only substituted fields should be reported as needed"""
+        template = ExplanationTemplate('{{country}} {name} chose {action!r}')
+        self.assertEqual(template.needed_fields, {'name', 'action'})
+
+    def test_reason_count_covers_last_reason_used(self):
+        """reason_count should reach the highest reason slot, not count the slots used"""
+        self.assertEqual(ExplanationTemplate('{primary_reason}').reason_count, 1)
+        self.assertEqual(ExplanationTemplate('{tertiary_reason}').reason_count, 3)
+        self.assertEqual(ExplanationTemplate('{primary_reason} {tertiary_reason}').reason_count, 3)
+        self.assertEqual(ExplanationTemplate('{country}').reason_count, 0)
+
+class TestExplanationHistory(unittest.TestCase):
+    """Test suite for recording and looking up decision explanations"""
+
+    DETAILS = {'action': 'raise tariffs', 'target_country': 'CHN'}
+
+    def test_get_explanation_for_eager_decision(self):
+        """Eagerly generated explanations should be retrievable by decision_id"""
+        system = AIExplanationSystem()
+        explanation = system.explain_decision('USA', 'trade', self.DETAILS)
+        decision_id = system.explanation_history['USA'][-1]['decision_id']
+        self.assertIsInstance(explanation, str)
+        self.assertEqual(system.get_explanation(decision_id), explanation)
+
+    def test_get_explanation_for_recorded_decision(self):
+        """Recorded decisions should return their decision_id and generate on request"""
+        system = AIExplanationSystem()
+        decision_id = system.record_decision('USA', 'trade', self.DETAILS)
+        entry = system.explanation_history['USA'][-1]
+        self.assertEqual(decision_id, entry['decision_id'])
+        self.assertIsNone(entry['explanation'])
+
+        explanation = system.get_explanation(decision_id)
+        self.assertIsInstance(explanation, str)
+        self.assertEqual(entry['explanation'], explanation)
+
+    def test_explain_decision_with_explanations_disabled(self):
+        """Disabled explanations should return a summary and defer the full text"""
+        system = AIExplanationSystem(explanations_enabled=False)
+        summary = system.explain_decision('USA', 'trade', self.DETAILS)
+        self.assertEqual(summary, 'USA took raise tariffs toward CHN: ')
+        self.assertIsNone(system.explanation_history['USA'][-1]['explanation'])
+
+        recent = system.get_recent_explanations('USA')
+        self.assertIsInstance(recent[0]['explanation'], str)
+
+    def test_get_explanation_after_eviction(self):
+        """Decisions that dropped out of the history should no longer resolve"""
+        system = AIExplanationSystem()
+        first_id = system.record_decision('USA', 'trade', self.DETAILS)
+        for _ in range(system.HISTORY_LIMIT):
+            system.record_decision('USA', 'trade', self.DETAILS)
+        self.assertIsNone(system.get_explanation(first_id))
+
+class TestExplanationGameState(unittest.TestCase):
+    """Test suite for reading countries and diplomacy from a changing game state"""
+
+    DETAILS = {'action': 'improve_relations', 'target_country': 'XYZ'}
+
+    def setUp(self):
+        self.game_state = SimpleNamespace(countries={}, diplomacy=None, current_turn=1)
+        self.system = AIExplanationSystem(self.game_state)
+
+    def test_countries_added_to_empty_mapping(self):
+        """Countries added to an initially empty mapping should be named"""
+        self.system.explain_decision('USA', 'diplomatic', self.DETAILS)
+        self.game_state.countries['XYZ'] = SimpleNamespace(name='Xyzland')
+        self.assertIn('Xyzland', self.system.explain_decision('USA', 'diplomatic', self.DETAILS))
+
+    def test_reassigned_countries(self):
+        """Replacing game_state.countries should be picked up without passing a game state"""
+        self.game_state.countries = {'XYZ': SimpleNamespace(name='Xyzland')}
+        self.assertIn('Xyzland', self.system.explain_decision('USA', 'diplomatic', self.DETAILS))
+        self.game_state.countries = {'XYZ': SimpleNamespace(name='New Xyzland')}
+        self.assertIn('New Xyzland', self.system.explain_decision('USA', 'diplomatic', self.DETAILS))
+
+    def test_countries_changed_in_place(self):
+        """Replaced, renamed and removed countries should be named from the live mapping"""
+        self.game_state.countries['XYZ'] = SimpleNamespace(name='Xyzland')
+        self.system.refresh()
+        self.assertEqual(self.system._get_country_name('XYZ'), 'Xyzland')
+        self.game_state.countries['XYZ'] = SimpleNamespace(name='New Xyzland')
+        self.assertEqual(self.system._get_country_name('XYZ'), 'New Xyzland')
+        self.game_state.countries['XYZ'].name = 'Renamed Xyzland'
+        self.assertEqual(self.system._get_country_name('XYZ'), 'Renamed Xyzland')
+        del self.game_state.countries['XYZ']
+        self.game_state.countries['ABC'] = SimpleNamespace(name='Abcland')
+        self.assertEqual(self.system._get_country_name('XYZ'), 'XYZ')
+
+    def test_reassigned_diplomacy(self):
+        """Replacing game_state.diplomacy should be picked up on the next explanation"""
+        coalition = Coalition('Trade Pact', 'trade', ['USA', 'CAN'], 1)
+        self.system.explain_decision('USA', 'diplomatic', self.DETAILS)
+        self.game_state.diplomacy = SimpleNamespace(coalitions=[coalition])
+        self.system.explain_decision('USA', 'diplomatic', self.DETAILS)
+        self.assertEqual(self.system._get_coalition_details(coalition.id)['name'], 'Trade Pact')
+
+class TestExplanationReasons(unittest.TestCase):
+    """Test suite for the reasons listed in generated explanations"""
+
+    def test_short_reason_list_padded_with_distinct_defaults(self):
+        """Missing reasons should be filled with different fallbacks, not one repeated"""
+        system = AIExplanationSystem(SimpleNamespace(countries={}, diplomacy=None, current_turn=1))
+        explanation = system.explain_decision('USA', 'trade', {'action': 'lower tariff', 'target_country': 'CHN'})
+        self.assertEqual(explanation.splitlines()[1:], [
+            '• General alignment with national economic strategy',
+            '• Internal policy considerations',
+            '• Domestic political factors'
+        ])
+
+    def test_simple_explanation_format(self):
+        """Explanations without game context should have no space before the colon"""
+        system = AIExplanationSystem()
+        self.assertEqual(system.explain_decision('MEX', 'trade', {'action': 'join', 'explanation': 'ok'}),
+                         'MEX took join: ok')
+        self.assertEqual(system.explain_decision('MEX', 'trade', {'action': 'join', 'target_country': 'USA'}),
+                         'MEX took join toward USA: ')
+
+class TestCoalition(unittest.TestCase):
+    """Test suite for coalition strength and membership"""
+
+    def test_strength_applies_cohesion_once(self):
+        """Member strengths should be summed and then scaled by cohesion a single time"""
+        coalition = Coalition('Trade Pact', 'trade', ['USA', 'CAN', 'MEX'], 1, cohesion_level=0.5)
+        game_state = SimpleNamespace(countries={
+            'USA': SimpleNamespace(gdp=2000),
+            'CAN': SimpleNamespace(gdp=1000),
+            'MEX': SimpleNamespace(gdp=1000)
+        })
+        self.assertAlmostEqual(coalition.get_strength(game_state), 4.0 * 0.75)
+
+    def test_ids_include_process(self):
+        """Coalition ids should be distinct and carry the creating process id"""
+        first = Coalition('Trade Pact', 'trade', ['USA'], 1)
+        second = Coalition('Trade Pact', 'trade', ['USA'], 1)
+        self.assertNotEqual(first.id, second.id)
+        self.assertIn(f"_{os.getpid()}_", first.id)
+
+    def test_leader_succession_follows_join_order(self):
+        """When the leader leaves, the longest-standing remaining member should take over"""
+        coalition = Coalition('Trade Pact', 'trade', ['USA', 'MEX'], 1)
+        coalition.add_country('CAN', 2)
+        coalition.remove_country('USA', 3)
+        self.assertEqual(coalition.leader_country, 'MEX')
+        coalition.remove_country('MEX', 4)
+        self.assertEqual(coalition.leader_country, 'CAN')
+
+    def test_leader_succession_for_untracked_members(self):
+        """Members added straight to the set should succeed in alphabetical order"""
+        coalition = Coalition('Trade Pact', 'trade', ['USA'], 1)
+        coalition.member_countries.update(('MEX', 'CAN'))
+        coalition.remove_country('USA', 2)
+        self.assertEqual(coalition.leader_country, 'CAN')
+
+if __name__ == '__main__':
+    unittest.main()
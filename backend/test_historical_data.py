@@ -0,0 +1,43 @@
+import unittest
+from backend.historical_data import HistoricalDataset
+
+class TestHistoricalDataset(unittest.TestCase):
+    """Test suite for HistoricalDataset queries"""
+
+    def test_historical_data_year_range(self):
+        """Test selecting a year range from historical data."""
+        dataset = HistoricalDataset()
+        dataset.data = {
+            'USA': {
+                'region': 'North America',
+                'yearly_data': {
+                    '2021': {'gdp_growth': 3.0},
+                    '2019': {'gdp_growth': 2.3},
+                    '2022': {'gdp_growth': 2.8},
+                    '2020': {'gdp_growth': 2.5}
+                }
+            }
+        }
+        
+        # Ranged results are returned in year order, bounds inclusive
+        self.assertEqual(list(dataset.get_historical_data('USA', 2020, 2022)), ['2020', '2021', '2022'])
+        self.assertEqual(list(dataset.get_historical_data('USA', start_year=2021)), ['2021', '2022'])
+        self.assertEqual(list(dataset.get_historical_data('USA', end_year=2020)), ['2019', '2020'])
+        self.assertEqual(dataset.get_historical_data('USA', 2023, 2025), {})
+
+    def test_benchmark_cache_is_bounded(self):
+        """Benchmark queries should be cached up to the limit, evicting the oldest first"""
+        dataset = HistoricalDataset()
+        dataset.BENCHMARK_CACHE_LIMIT = 2
+        dataset.data = {'USA': {'region': 'North America', 'yearly_data': {'2020': {'gdp_growth': 2.5}}}}
+        dataset._calculate_averages()
+        dataset.loaded = True
+        
+        for years in ([2020], [2021], [2020, 2021]):
+            dataset.get_benchmark_data('USA', 'gdp_growth', years)
+        self.assertEqual(list(dataset._benchmark_cache),
+                         [('USA', 'gdp_growth', (2021,)), ('USA', 'gdp_growth', (2020, 2021))])
+        self.assertEqual(dataset.get_benchmark_data('USA', 'gdp_growth', [2020])['country_values'], [2.5])
+
+if __name__ == '__main__':
+    unittest.main()
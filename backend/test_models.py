@@ -0,0 +1,41 @@
+import unittest
+from backend import models
+from backend.models import TradeBloc, get_trade_bloc_for_country
+
+class TestTradeBlocLookup(unittest.TestCase):
+    """Test suite for get_trade_bloc_for_country"""
+
+    def setUp(self):
+        self.saved_blocs = list(models.TRADE_BLOCS)
+        self.bloc = TradeBloc('Test Bloc', ['AAA', 'BBB'])
+        models.TRADE_BLOCS.append(self.bloc)
+
+    def tearDown(self):
+        models.TRADE_BLOCS[:] = self.saved_blocs
+
+    def test_existing_blocs(self):
+        """Members of the predefined blocs should resolve to their bloc"""
+        self.assertEqual(get_trade_bloc_for_country('DNK').name, 'EU')
+        self.assertEqual(get_trade_bloc_for_country('MEX').name, 'NAFTA')
+        self.assertIsNone(get_trade_bloc_for_country('XXX'))
+
+    def test_added_bloc(self):
+        """A bloc appended to TRADE_BLOCS should be found"""
+        self.assertIs(get_trade_bloc_for_country('AAA'), self.bloc)
+        models.TRADE_BLOCS.remove(self.bloc)
+        self.assertIsNone(get_trade_bloc_for_country('AAA'))
+
+    def test_membership_changes(self):
+        """Members appended to or removed from a bloc's list should be reflected"""
+        self.bloc.members.append('CCC')
+        self.assertIs(get_trade_bloc_for_country('CCC'), self.bloc)
+        self.bloc.members.remove('AAA')
+        self.assertIsNone(get_trade_bloc_for_country('AAA'))
+
+    def test_first_bloc_wins(self):
+        """A country in several blocs should resolve to the first one"""
+        self.bloc.members.append('USA')
+        self.assertEqual(get_trade_bloc_for_country('USA').name, 'NAFTA')
+
+if __name__ == '__main__':
+    unittest.main()